@@ -0,0 +1,89 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of registered (precompiled) statements against queries built on every execution.
+
+Runs the same parameterised ``meta`` lookup in a loop, building the Core query each time as
+``DBConnection.schema_type`` used to, and via :meth:`~ensembl.database.DBConnection.execute_statement()`.
+
+Typical usage example::
+
+    $ python benchmarks/bench_compiled_statements.py --iterations 20000
+    $ python benchmarks/bench_compiled_statements.py --url mysql://ensro@mysql-server:4242/mydb
+
+"""
+
+import argparse
+from pathlib import Path
+import tempfile
+import timeit
+
+from sqlalchemy import bindparam, select, text
+
+from ensembl.database import DBConnection
+
+
+def create_database(db_path: Path) -> str:
+    """Creates an SQLite database with a populated ``meta`` table and returns its URL.
+
+    Args:
+        db_path: Path of the SQLite database file.
+
+    """
+    url = f"sqlite:///{db_path}"
+    dbc = DBConnection(url, reflect=False)
+    with dbc.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE meta (meta_id INTEGER PRIMARY KEY, species_id INTEGER, meta_key VARCHAR(40), "
+            "meta_value VARCHAR(255))"
+        ))
+        conn.execute(
+            text("INSERT INTO meta (species_id, meta_key, meta_value) VALUES (1, :key, :value)"),
+            [{'key': f"key_{i}", 'value': f"value_{i}"} for i in range(1000)]
+        )
+    dbc.dispose()
+    return url
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time per query of each approach."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="URL of a database with a 'meta' table (default: temporary SQLite)")
+    parser.add_argument('--iterations', type=int, default=10000, help="number of queries per approach")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = args.url if args.url else create_database(Path(tmp_dir) / 'bench.db')
+        dbc = DBConnection(url, reflect=False)
+        meta = dbc.tables['meta']
+        keys = [f"key_{i % 1000}" for i in range(args.iterations)]
+
+        def ad_hoc() -> None:
+            for key in keys:
+                query = select([meta.columns.meta_value]).where(text('meta_key = :meta_key'))
+                dbc.execute(query, meta_key=key).all()
+
+        query = select([meta.columns.meta_value]).where(meta.columns.meta_key == bindparam('meta_key'))
+        dbc.register_statement('meta_value', query)
+
+        def registered() -> None:
+            for key in keys:
+                dbc.execute_statement('meta_value', meta_key=key).all()
+
+        for name, func in (('ad hoc', ad_hoc), ('registered', registered)):
+            seconds = min(timeit.repeat(func, number=1, repeat=3))
+            print(f"{name:>10}: {seconds / args.iterations * 1e6:8.1f} us/query ({seconds:.2f}s in total)")
+        dbc.dispose()
+
+
+if __name__ == '__main__':
+    main()
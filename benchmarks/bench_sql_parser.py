@@ -0,0 +1,135 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the tokenizer-based SQL schema parser of UnitTestDB against the former line-based one.
+
+Parses the given schema file, typically the ``table.sql`` of the Ensembl core schema (``sql/table.sql`` in
+the `ensembl` repository), with both parsers and reports the time taken and the number of statements found.
+If no file is given, a schema of similar size and style (documentation blocks, comments, ``DEFAULT``
+values and indexes) is generated instead.
+
+Typical usage example::
+
+    $ python benchmarks/bench_sql_parser.py --sql path/to/ensembl/sql/table.sql
+
+"""
+
+import argparse
+from pathlib import Path
+import re
+import tempfile
+import timeit
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.sql.expression import TextClause
+
+from ensembl.database import UnitTestDB
+
+
+def parse_by_line(filepath: Path) -> Iterator[Tuple[TextClause, str]]:
+    """Yields each SQL query and the table it creates, as the former ``UnitTestDB._parse_sql_file()`` and
+    ``UnitTestDB._get_table_name()`` did.
+
+    Args:
+        filepath: SQL file path.
+
+    """
+    comment_block_start = re.compile(r'\/\*\*')
+    comment_block_end = re.compile(r'\*\/$')
+    single_comment = re.compile(r'(--|#|\/\/).*')
+    inline_comment = re.compile(r'\/\*[^\*]*\*\/')
+    table_name = re.compile(r'^CREATE[ ]+TABLE[ ]+(`[^`]+`|[^ ]+)')
+    with open(filepath) as sql_file:
+        query = []  # type: List[str]
+        multiline_comment = False
+        for line in sql_file:
+            line = line.strip(' \n')
+            if comment_block_start.match(line):
+                multiline_comment = True
+                continue
+            if comment_block_end.search(line):
+                multiline_comment = False
+                continue
+            if not multiline_comment:
+                line = single_comment.sub('', line)
+                line = inline_comment.sub('', line)
+                if line:
+                    query.append(line)
+                    if line.endswith(';'):
+                        statement = text(' '.join(query))
+                        match = table_name.search(str(statement))
+                        yield statement, match.group(1).strip('`') if match else ''
+                        query = []
+
+
+def create_schema(filepath: Path, num_tables: int) -> None:
+    """Writes an Ensembl-core-like schema file with the given number of tables.
+
+    Args:
+        filepath: SQL file path.
+        num_tables: Number of tables.
+
+    """
+    with filepath.open('w') as sql_file:
+        for index in range(num_tables):
+            sql_file.write(
+                f"/**\n@table table_{index}\n\n@colour #808000\n\n@desc Stores the data of table {index}.\n\n"
+                f"@column table_{index}_id  Primary key, internal identifier.\n"
+                f"@column name              Name of the entry.\n\n@see other_table\n*/\n\n"
+                f"CREATE TABLE `table_{index}` (\n"
+                f"  `table_{index}_id`  INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,\n"
+                f"  `seq_region_id`     INT(10) UNSIGNED NOT NULL,\n"
+                f"  `seq_region_start`  INT(10) UNSIGNED NOT NULL,\n"
+                f"  `seq_region_strand` TINYINT(2) NOT NULL DEFAULT '1',\n"
+                f"  `name`              VARCHAR(255) NOT NULL DEFAULT '',  # free text\n"
+                f"  `biotype`           ENUM('protein_coding', 'lncRNA', 'other') NOT NULL,\n"
+                f"  `description`       TEXT,\n"
+                f"  PRIMARY KEY (`table_{index}_id`),\n"
+                f"  KEY `seq_region_idx` (`seq_region_id`, `seq_region_start`),\n"
+                f"  KEY `name_idx` (`name`)\n"
+                f") COLLATE=latin1_swedish_ci ENGINE=MyISAM;\n\n"
+            )
+        sql_file.write(
+            "# Add schema type and schema version to the meta table.\n"
+            "INSERT INTO meta (species_id, meta_key, meta_value) VALUES\n"
+            "  (NULL, 'schema_type', 'core'), (NULL, 'schema_version', '111');\n"
+        )
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time taken by each parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sql', type=Path, help="schema file to parse (default: generated)")
+    parser.add_argument('--tables', type=int, default=100, help="number of tables of the generated schema")
+    parser.add_argument('--repeat', type=int, default=20, help="number of times each file is parsed")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sql_path = args.sql
+        if not sql_path:
+            sql_path = Path(tmp_dir) / 'table.sql'
+            create_schema(sql_path, args.tables)
+        parse_sql_file = UnitTestDB._parse_sql_file  # pylint: disable=protected-access
+        parsers = (
+            ('line-based', lambda: list(parse_by_line(sql_path))),
+            ('tokenizer', lambda: list(parse_sql_file(sql_path))),
+        )
+        for name, func in parsers:
+            seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            statements = func()
+            tables = sum(1 for _, table in statements if table)
+            print(f"{name:>10}: {seconds * 1e3:7.1f} ms ({len(statements)} statements, {tables} tables)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the in-process SQLite loading of UnitTestDB against the ``sqlite3`` command line tool.
+
+Generates a dump with several tables of random rows and loads it into a new SQLite database with
+:class:`~ensembl.database.UnitTestDB`, and with one ``sqlite3 .import`` process per table, as
+``UnitTestDB`` used to. The latter is skipped if ``sqlite3`` is not found on ``PATH``. Only the time spent
+loading the data is reported, as the schema is created the same way in both cases.
+
+Typical usage example::
+
+    $ python benchmarks/bench_sqlite_loading.py --tables 20 --rows 50000
+
+"""
+
+import argparse
+import os
+from pathlib import Path
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+
+from ensembl.database import UnitTestDB
+
+
+def create_dump(dump_dir: Path, num_tables: int, num_rows: int) -> None:
+    """Writes the schema and TSV data files of a dump with the given number of tables and rows.
+
+    Args:
+        dump_dir: Directory where to write the dump.
+        num_tables: Number of tables.
+        num_rows: Number of rows per table.
+
+    """
+    dump_dir.mkdir()
+    rand = random.Random(42)
+    with (dump_dir / 'table.sql').open('w') as sql_file:
+        for index in range(num_tables):
+            sql_file.write(
+                f"CREATE TABLE `table_{index}` (`id` INTEGER NOT NULL, `parent_id` INTEGER DEFAULT NULL,\n"
+                f"  `name` VARCHAR(40) NOT NULL, `score` DOUBLE, PRIMARY KEY (`id`));\n"
+            )
+    for index in range(num_tables):
+        with (dump_dir / f"table_{index}.txt").open('w') as tsv_file:
+            for row_id in range(1, num_rows + 1):
+                parent_id = rand.randint(1, row_id) if row_id % 10 else '\\N'
+                tsv_file.write(f"{row_id}\t{parent_id}\tname_{rand.random():.8f}\t{rand.random()}\n")
+
+
+def load_with_cli(dump_dir: Path) -> float:
+    """Loads the dump into a new SQLite database with one ``sqlite3 .import`` process per table, and returns
+    the time spent loading the data.
+
+    Args:
+        dump_dir: Directory of the dump.
+
+    """
+    # The CLI does not understand MySQL-specific syntax, so create the schema via UnitTestDB without data
+    schema_dir = dump_dir.parent / 'schema'
+    schema_dir.mkdir()
+    shutil.copy(dump_dir / 'table.sql', schema_dir)
+    schema_db = UnitTestDB('sqlite:///', schema_dir, 'cli')
+    schema_db.dbc.dispose()
+    start = time.perf_counter()
+    for data_file in sorted(dump_dir.glob('*.txt')):
+        subprocess.run(
+            ['sqlite3', schema_db.dbc.db_name, '.mode tabs', f".import {data_file} {data_file.stem}"],
+            check=True
+        )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints the time taken by each approach."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tables', type=int, default=10, help="number of tables in the dump")
+    parser.add_argument('--rows', type=int, default=20000, help="number of rows per table")
+    args = parser.parse_args()
+    os.environ.setdefault('USER', 'bench')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # SQLite databases are created in the current working directory
+        os.chdir(tmp_dir)
+        dump_dir = Path(tmp_dir) / 'dump'
+        create_dump(dump_dir, args.tables, args.rows)
+        db = UnitTestDB('sqlite:///', dump_dir, 'in_process')
+        db.dbc.dispose()
+        print(f"{'in-process':>12}: {sum(db.load_times.values()):.2f}s")
+        if shutil.which('sqlite3'):
+            print(f"{'sqlite3 CLI':>12}: {load_with_cli(dump_dir):.2f}s")
+        else:
+            print(f"{'sqlite3 CLI':>12}: skipped, 'sqlite3' not found")
+
+
+if __name__ == '__main__':
+    main()
@@ -41,6 +41,11 @@ setup(
     include_package_data=True,
     install_requires=import_requirements('requirements.txt'),
     tests_require=import_requirements('requirements-test.txt'),
+    extras_require={
+        'async': ['aiomysql', 'aiosqlite'],
+        'parquet': ['pyarrow'],
+        'zstd': ['zstandard'],
+    },
     long_description=readme,
     author='Ensembl',
     author_email='dev@ensembl.org',
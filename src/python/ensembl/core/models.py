@@ -1057,7 +1057,7 @@ class TranscriptSupportingFeature(Base):
 
 
 class TranslationAttrib(Base):
-    __tablename__ = ("translation_attrib",)
+    __tablename__ = "translation_attrib"
     __table_args__ = (
         Index("type_val_idx", "attrib_type_id", "value"),
         Index(
@@ -14,4 +14,11 @@
 """Database module."""
 
 from .dbconnection import *
+from .instrumentation import *
+from .replicas import *
+from .resultcache import *
+from .asyncdbconnection import *
+from .registry import *
 from .unittestdb import *
+from .export import *
+from .server import *
@@ -0,0 +1,263 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Parallel table export.
+
+This module provides the function to dump a table into a file, splitting it into primary key ranges that are
+exported concurrently, each one through its own database connection. The resulting TSV files follow the
+``<table_name>.txt`` convention of the dumps loaded by :class:`~ensembl.database.UnitTestDB`.
+
+Typical usage example::
+
+    from ensembl.database import DBConnection, export_table
+    dbc = DBConnection('mysql://ensro@mysql-server:4242/mydb')
+    # Dump the "xref" table into "path/to/dumps/xref.txt" using 8 concurrent connections
+    export_table(dbc, 'xref', 'path/to/dumps', num_workers=8)
+
+"""
+
+__all__ = ['export_table']
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import os
+from pathlib import Path
+import shutil
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import sqlalchemy
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import select
+
+from .dbconnection import DBConnection
+from .tsv import format_row
+
+
+logger = logging.getLogger(__name__)
+
+_FILE_EXTENSIONS = {'tsv': 'txt', 'parquet': 'parquet'}
+# Engine arguments that only apply to pooled connections, dropped as each worker uses a single connection
+_POOL_SIZING_ARGS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_use_lifo')
+
+
+def export_table(dbc: DBConnection, table: str, dump_dir: Union[str, os.PathLike], num_workers: int = 4,
+                 num_partitions: Optional[int] = None, columns: Optional[List[str]] = None,
+                 file_format: str = 'tsv', use_processes: bool = False, batch_size: int = 10000) -> Path:
+    """Exports the given table into a file, splitting the work into primary key ranges exported concurrently.
+
+    The table is partitioned by ranges of the first column of its primary key, so only tables with an integer
+    leading primary key column can be exported in parallel. Any other table is exported in one go. Each
+    partition is dumped, sorted by primary key, into a temporary file. The temporary files are concatenated in
+    order at the end, so the resulting file is sorted by primary key as well.
+
+    Args:
+        dbc: Database connection handler. Each worker opens its own connection to the same database, with
+            the same engine arguments (e.g. ``connect_args``) but without a connection pool.
+        table: Table name.
+        dump_dir: Directory where to write the file ``<table>.txt`` (TSV) or ``<table>.parquet`` (Parquet).
+        num_workers: Maximum number of partitions exported concurrently.
+        num_partitions: Number of primary key ranges to split the table into. By default, `num_workers`.
+        columns: Column names to export. By default, all the columns.
+        file_format: Output file format: ``tsv`` or ``parquet`` (requires ``pyarrow``).
+        use_processes: Use a pool of processes instead of threads, to spread the encoding of the rows
+            across several CPUs.
+        batch_size: Number of rows fetched from the server at a time by each worker.
+
+    Returns:
+        Path of the exported file.
+
+    Raises:
+        KeyError: If `table` is not in the database.
+        ValueError: If `file_format` is not supported.
+
+    """
+    if file_format not in _FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported file format '{file_format}'")
+    dump_path = Path(dump_dir)
+    dump_path.mkdir(parents=True, exist_ok=True)
+    if not columns:
+        columns = dbc.get_columns(table)
+    ranges = _get_key_ranges(dbc, table, num_partitions if num_partitions else num_workers)
+    extension = _FILE_EXTENSIONS[file_format]
+    part_paths = [dump_path / f".{table}.{i}.{extension}" for i in range(len(ranges))]
+    engine_kwargs = {
+        key: value for key, value in dbc.engine_kwargs.items() if key not in _POOL_SIZING_ARGS
+    }
+    engine_kwargs['poolclass'] = NullPool
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=num_workers)  # type: Executor
+    else:
+        executor = ThreadPoolExecutor(max_workers=num_workers)
+    filepath = dump_path / f"{table}.{extension}"
+    try:
+        with executor:
+            futures = [
+                executor.submit(_export_range, dbc.url, engine_kwargs, table, columns, key_range, part_path,
+                                file_format, batch_size)
+                for key_range, part_path in zip(ranges, part_paths)
+            ]
+            num_rows = sum(future.result() for future in futures)
+        if file_format == 'parquet':
+            _merge_parquet_files(part_paths, filepath)
+        else:
+            with filepath.open('wb') as out_file:
+                for part_path in part_paths:
+                    with part_path.open('rb') as part_file:
+                        shutil.copyfileobj(part_file, out_file)
+    finally:
+        # Remove the partition files, including those left by a failed export
+        for part_path in part_paths:
+            if part_path.exists():
+                part_path.unlink()
+    logger.info(f"Exported {num_rows} rows from '{table}' to {filepath} ({len(ranges)} partitions)")
+    return filepath
+
+
+def _get_key_ranges(dbc: DBConnection, table: str, num_partitions: int) -> List[Tuple]:
+    """Returns the list of `(column, start, end)` primary key ranges, `end` excluded, that cover the table.
+
+    If the table cannot be partitioned, a single range `(None, None, None)` is returned.
+
+    Args:
+        dbc: Database connection handler.
+        table: Table name.
+        num_partitions: Maximum number of ranges.
+
+    """
+    key_columns = dbc.get_primary_key_columns(table)
+    if not key_columns:
+        return [(None, None, None)]
+    column = dbc.tables[table].columns[key_columns[0]]
+    if not isinstance(column.type, sqlalchemy.types.Integer):
+        logger.warning(f"Table '{table}' has a non-integer primary key: exporting it as a single partition")
+        return [(None, None, None)]
+    stats = dbc.table_stats(table)
+    min_key, max_key = stats.min_key, stats.max_key
+    if min_key is None:
+        return [(None, None, None)]
+    step = max(1, -(-(max_key - min_key + 1) // num_partitions))
+    return [
+        (column.name, start, min(start + step, max_key + 1)) for start in range(min_key, max_key + 1, step)
+    ]
+
+
+def _export_range(url: str, engine_kwargs: Dict[str, Any], table: str, columns: List[str], key_range: Tuple,
+                  filepath: Path, file_format: str, batch_size: int) -> int:
+    """Exports the rows of the table within the given primary key range and returns the number of rows.
+
+    Args:
+        url: URL of the database.
+        engine_kwargs: Extra arguments to configure the engine of the worker's connection.
+        table: Table name.
+        columns: Column names to export.
+        key_range: Tuple `(column, start, end)` of the range to export, `end` excluded.
+        filepath: Path of the file to write.
+        file_format: Output file format.
+        batch_size: Number of rows fetched from the server at a time.
+
+    """
+    dbc = DBConnection(url, reflect=False, **engine_kwargs)
+    try:
+        table_obj = dbc.tables[table]
+        key_columns = [table_obj.columns[name] for name in dbc.get_primary_key_columns(table)]
+        query = select([table_obj.columns[name] for name in columns]).order_by(*key_columns)
+        key_column, start, end = key_range
+        if key_column is not None:
+            column = table_obj.columns[key_column]
+            query = query.where(column >= start).where(column < end)
+        batches = dbc.stream(query, batch_size=batch_size, batches=True)
+        if file_format == 'parquet':
+            return _write_parquet_file(batches, table_obj, columns, filepath)
+        num_rows = 0
+        with filepath.open('w') as out_file:
+            for batch in batches:
+                out_file.writelines(format_row(row) for row in batch)
+                num_rows += len(batch)
+        return num_rows
+    finally:
+        dbc.dispose()
+
+
+def _write_parquet_file(batches: Iterator[List[sqlalchemy.engine.Row]], table: sqlalchemy.schema.Table,
+                        columns: List[str], filepath: Path) -> int:
+    """Writes the given batches of rows into a Parquet file and returns the number of rows written.
+
+    Args:
+        batches: Iterator of lists of rows.
+        table: Table the rows belong to.
+        columns: Column names of the rows.
+        filepath: Path of the file to write.
+
+    """
+    import pyarrow  # pylint: disable=import-outside-toplevel
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+    schema = pyarrow.schema(
+        [(name, _get_arrow_type(pyarrow, table.columns[name].type)) for name in columns]
+    )
+    num_rows = 0
+    with pyarrow.parquet.ParquetWriter(str(filepath), schema) as writer:
+        for batch in batches:
+            arrays = []
+            for i, field in enumerate(schema):
+                values = [row[i] for row in batch]
+                if pyarrow.types.is_string(field.type):
+                    values = [value if value is None or isinstance(value, str) else str(value)
+                              for value in values]
+                arrays.append(pyarrow.array(values, type=field.type))
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            num_rows += len(batch)
+    return num_rows
+
+
+def _get_arrow_type(pyarrow, column_type: sqlalchemy.types.TypeEngine):
+    """Returns the Arrow data type equivalent to the given SQLAlchemy column type.
+
+    Args:
+        pyarrow: ``pyarrow`` module.
+        column_type: SQLAlchemy column type.
+
+    """
+    if isinstance(column_type, sqlalchemy.types.Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, sqlalchemy.types.Integer):
+        return pyarrow.int64()
+    if isinstance(column_type, sqlalchemy.types.Float):
+        return pyarrow.float64()
+    if isinstance(column_type, sqlalchemy.types.Numeric):
+        return pyarrow.decimal128(column_type.precision or 38, column_type.scale or 0)
+    if isinstance(column_type, sqlalchemy.types.DateTime):
+        return pyarrow.timestamp('us')
+    if isinstance(column_type, sqlalchemy.types.Date):
+        return pyarrow.date32()
+    if isinstance(column_type, sqlalchemy.types.LargeBinary):
+        return pyarrow.binary()
+    return pyarrow.string()
+
+
+def _merge_parquet_files(part_paths: List[Path], filepath: Path) -> None:
+    """Concatenates the given Parquet files into a new one, one row group at a time.
+
+    Args:
+        part_paths: Paths of the Parquet files to concatenate, all sharing the same schema.
+        filepath: Path of the file to write.
+
+    """
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+    schema = pyarrow.parquet.read_schema(str(part_paths[0]))
+    with pyarrow.parquet.ParquetWriter(str(filepath), schema) as writer:
+        for part_path in part_paths:
+            part_file = pyarrow.parquet.ParquetFile(str(part_path))
+            for i in range(part_file.num_row_groups):
+                writer.write_table(part_file.read_row_group(i))
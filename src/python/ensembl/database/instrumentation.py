@@ -0,0 +1,260 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Query instrumentation.
+
+This module provides the classes to collect per-statement execution statistics from an engine: number of
+executions, latency histogram, number of rows and a log of the slowest queries. Statements are grouped by
+their fingerprint, i.e. the SQL text with every literal and bound parameter replaced by a placeholder.
+
+Typical usage example::
+
+    from ensembl.database import DBConnection
+    dbc = DBConnection('mysql://ensro@mysql-server:4242/mydb')
+    with dbc.instrument(slow_query_threshold=1.0) as stats:
+        ...
+    for statement in stats.top(5):
+        print(statement.fingerprint, statement.count, statement.total_seconds)
+
+"""
+
+__all__ = ['fingerprint', 'SlowQuery', 'StatementStats', 'QueryStats']
+
+import collections
+from dataclasses import dataclass, field
+import logging
+import re
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import sqlalchemy
+from sqlalchemy import event
+
+
+logger = logging.getLogger(__name__)
+
+_FINGERPRINT_SUBS = [
+    (re.compile(r'/\*.*?\*/', re.DOTALL), ' '),
+    (re.compile(r'(--|#)[^\n]*'), ' '),
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), '?'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), '?'),
+    (re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b'), '?'),
+    (re.compile(r'%\(\w+\)s|%s|(?<!:):\w+'), '?'),
+    (re.compile(r'\s+'), ' '),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+'), '(...)'),
+]
+
+#: Default upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+def fingerprint(statement: str) -> str:
+    """Returns the normalised form of the given SQL statement.
+
+    Comments are removed, string and numeric literals and bound parameters are replaced by ``?``, lists of
+    values (e.g. ``IN (1, 2, 3)`` or multi-row ``VALUES``) are collapsed into ``(...)`` and whitespaces are
+    squashed, so every execution of the same query shares the same fingerprint.
+
+    Args:
+        statement: SQL statement.
+
+    """
+    for pattern, replacement in _FINGERPRINT_SUBS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip().rstrip(';').rstrip()
+
+
+@dataclass
+class SlowQuery:
+    """Execution of a statement that took longer than the slow query threshold.
+
+    Attributes:
+        fingerprint: Normalised statement.
+        statement: SQL statement as sent to the database.
+        parameters: Bound parameter values.
+        seconds: Execution time, in seconds.
+        timestamp: Time when the execution started, in seconds since the epoch.
+
+    """
+    fingerprint: str
+    statement: str
+    parameters: Any
+    seconds: float
+    timestamp: float
+
+
+@dataclass
+class StatementStats:
+    """Execution statistics of all the statements sharing the same fingerprint.
+
+    Attributes:
+        fingerprint: Normalised statement.
+        buckets: Upper bounds (in seconds) of the latency histogram buckets.
+        histogram: Number of executions per latency bucket, with an extra last bucket for executions slower
+            than the last bound.
+        count: Number of executions.
+        total_seconds: Total execution time, in seconds.
+        max_seconds: Longest execution time, in seconds.
+        rows: Number of rows matched or affected, as reported by the DBAPI cursor. Executions for which the
+            driver does not report it (e.g. ``SELECT`` statements in SQLite) are not accounted for.
+
+    """
+    fingerprint: str
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+    histogram: List[int] = field(default_factory=list)
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    rows: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.histogram:
+            self.histogram = [0] * (len(self.buckets) + 1)
+
+    @property
+    def mean_seconds(self) -> float:
+        """Average execution time, in seconds."""
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def add(self, seconds: float, rows: int) -> None:
+        """Accounts for one more execution of the statement.
+
+        Args:
+            seconds: Execution time, in seconds.
+            rows: Number of rows reported by the cursor, negative if unknown.
+
+        """
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if rows > 0:
+            self.rows += rows
+        index = 0
+        while index < len(self.buckets) and seconds > self.buckets[index]:
+            index += 1
+        self.histogram[index] += 1
+
+
+class QueryStats:
+    """Collects execution statistics of the statements executed through the engines it is attached to.
+
+    Args:
+        slow_query_threshold: Minimum execution time, in seconds, for a query to be logged (as a warning) and
+            kept in :attr:`slow_queries`. By default, no query is considered slow.
+        max_slow_queries: Maximum number of slow queries kept, discarding the oldest ones first.
+        buckets: Upper bounds (in seconds) of the latency histogram buckets.
+
+    Attributes:
+        statements: Statistics of each statement keyed to its fingerprint.
+        slow_queries: Latest slow queries.
+
+    """
+    def __init__(self, slow_query_threshold: Optional[float] = None, max_slow_queries: int = 1000,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self.buckets = tuple(buckets)
+        self.statements = {}  # type: Dict[str, StatementStats]
+        self.slow_queries = collections.deque(maxlen=max_slow_queries)  # type: Deque[SlowQuery]
+        self._lock = threading.Lock()
+        # Key to store the start time of the running statement in the connection's info dictionary
+        self._start_key = f'query_stats_{id(self)}'
+
+    def __repr__(self) -> str:
+        """Returns a string representation of this object."""
+        return f'{self.__class__.__name__}(queries={self.total_queries}, seconds={self.total_seconds:.3f})'
+
+    @property
+    def total_queries(self) -> int:
+        """Total number of statements executed."""
+        return sum(stats.count for stats in self.statements.values())
+
+    @property
+    def total_seconds(self) -> float:
+        """Total execution time of all statements, in seconds."""
+        return sum(stats.total_seconds for stats in self.statements.values())
+
+    def top(self, limit: int = 10, key: str = 'total_seconds') -> List[StatementStats]:
+        """Returns the statistics of the statements with the highest value of the given attribute.
+
+        Args:
+            limit: Maximum number of statements to return.
+            key: :class:`StatementStats` attribute to sort by, e.g. ``total_seconds``, ``count``,
+                ``max_seconds``, ``mean_seconds`` or ``rows``.
+
+        """
+        with self._lock:
+            statements = list(self.statements.values())
+        return sorted(statements, key=lambda stats: getattr(stats, key), reverse=True)[:limit]
+
+    def reset(self) -> None:
+        """Discards all the statistics collected so far."""
+        with self._lock:
+            self.statements.clear()
+            self.slow_queries.clear()
+
+    def record(self, statement: str, parameters: Any, seconds: float, rows: int = -1) -> None:
+        """Accounts for one execution of the given statement.
+
+        Args:
+            statement: SQL statement.
+            parameters: Bound parameter values.
+            seconds: Execution time, in seconds.
+            rows: Number of rows reported by the cursor, negative if unknown.
+
+        """
+        key = fingerprint(statement)
+        with self._lock:
+            if key not in self.statements:
+                self.statements[key] = StatementStats(key, self.buckets)
+            self.statements[key].add(seconds, rows)
+            if self.slow_query_threshold is not None and seconds >= self.slow_query_threshold:
+                slow_query = SlowQuery(key, statement, parameters, seconds, time.time() - seconds)
+                self.slow_queries.append(slow_query)
+                logger.warning(f"Slow query ({seconds:.3f}s): {statement}")
+
+    def attach(self, engine: sqlalchemy.engine.Engine) -> None:
+        """Starts collecting the statistics of the statements executed through the given engine.
+
+        Args:
+            engine: Database engine.
+
+        """
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def detach(self, engine: sqlalchemy.engine.Engine) -> None:
+        """Stops collecting the statistics of the statements executed through the given engine.
+
+        Args:
+            engine: Database engine.
+
+        """
+        event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(  # pylint: disable=unused-argument,too-many-arguments
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        conn.info.setdefault(self._start_key, []).append(time.perf_counter())
+
+    def _after_cursor_execute(  # pylint: disable=unused-argument,too-many-arguments
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        start_times = conn.info.get(self._start_key)
+        if not start_times:
+            # Collection started while the statement was running
+            return
+        seconds = time.perf_counter() - start_times.pop()
+        self.record(statement, parameters, seconds, cursor.rowcount)
@@ -0,0 +1,200 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Read replica routing.
+
+This module provides the class to spread read-only queries across several identical copies of a database,
+choosing a replica per query either in turns or by lowest observed latency, and skipping the replicas that
+failed recently. It is meant to be used through :class:`~ensembl.database.DBConnection`.
+
+Typical usage example::
+
+    from ensembl.database import DBConnection
+    dbc = DBConnection(
+        'mysql://ensro@mysql-server-1:4242/mydb',
+        replicas=['mysql://ensro@mysql-server-2:4242/mydb', 'mysql://ensro@mysql-server-3:4242/mydb'],
+        routing='least_latency'
+    )
+    # Read-only queries are run on one of the replicas, any other on the primary database
+    results = dbc.execute('SELECT * FROM my_table;')
+
+"""
+
+__all__ = ['ReplicaSet']
+
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import sqlalchemy
+from sqlalchemy import create_engine, text
+
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest measurement in the moving average of each replica's latency
+_LATENCY_SMOOTHING = 0.2
+
+
+class _Replica:
+    """Engine and health status of one replica.
+
+    Args:
+        engine: Database engine of the replica.
+
+    """
+    def __init__(self, engine: sqlalchemy.engine.Engine) -> None:
+        self.engine = engine
+        self.latency = None  # type: Optional[float]
+        self.down_until = 0.0
+
+    @property
+    def url(self) -> str:
+        """URL of the replica, with its password masked."""
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaSet:
+    """Set of read replicas of a database, handing out connections to them in routing order.
+
+    A replica that fails to connect is considered down, and thus skipped, for `cooldown` seconds. It is tried
+    again afterwards, or earlier if :meth:`check_health()` finds it reachable.
+
+    Args:
+        urls: URLs to the replicas.
+        routing: Replica selection strategy: ``round_robin`` takes turns among the available replicas,
+            whilst ``least_latency`` picks the one with the lowest moving average of the query latency.
+        cooldown: Number of seconds a replica is skipped after failing.
+        **kwargs: Extra arguments passed on to :func:`~sqlalchemy.create_engine()` for every replica.
+
+    Raises:
+        ValueError: If `routing` is not supported.
+
+    """
+
+    #: Supported replica selection strategies
+    routings = ('round_robin', 'least_latency')
+
+    def __init__(self, urls: Iterable[Union[str, sqlalchemy.engine.url.URL]], routing: str = 'round_robin',
+                 cooldown: float = 30.0, **kwargs) -> None:
+        if routing not in self.routings:
+            raise ValueError(f"Unsupported routing '{routing}', expected one of {self.routings}")
+        self._replicas = [_Replica(create_engine(url, **kwargs)) for url in urls]
+        self._routing = routing
+        self._cooldown = cooldown
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Returns a string representation of this object."""
+        return f'{self.__class__.__name__}({[replica.url for replica in self._replicas]!r})'
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    @property
+    def routing(self) -> str:
+        """Replica selection strategy."""
+        return self._routing
+
+    @property
+    def engines(self) -> List[sqlalchemy.engine.Engine]:
+        """Database engines of the replicas."""
+        return [replica.engine for replica in self._replicas]
+
+    @property
+    def available(self) -> List[str]:
+        """URLs of the replicas currently considered up."""
+        now = time.monotonic()
+        return [replica.url for replica in self._replicas if replica.down_until <= now]
+
+    def connect(self, **kwargs) -> Optional[Tuple[_Replica, sqlalchemy.engine.Connection]]:
+        """Returns a new connection to the first available replica in routing order that accepts it, along
+        with the replica itself, or ``None`` if no replica is available.
+
+        Args:
+            **kwargs: Extra arguments passed on to :meth:`~sqlalchemy.engine.Engine.connect()`.
+
+        """
+        for replica in self._get_candidates():
+            try:
+                return replica, replica.engine.connect(**kwargs)
+            except sqlalchemy.exc.DBAPIError as exc:
+                self.mark_down(replica, exc)
+        return None
+
+    def mark_down(self, replica: _Replica, error: Optional[Exception] = None) -> None:
+        """Skips the given replica for the cooldown period.
+
+        Args:
+            replica: Replica that failed.
+            error: Exception raised by the replica.
+
+        """
+        with self._lock:
+            replica.down_until = time.monotonic() + self._cooldown
+        logger.warning(f"Replica {replica.engine.url!r} is down for {self._cooldown}s: {error}")
+
+    def record_latency(self, replica: _Replica, seconds: float) -> None:
+        """Updates the moving average of the latency of the given replica.
+
+        Args:
+            replica: Replica that ran the query.
+            seconds: Execution time of the query, in seconds.
+
+        """
+        with self._lock:
+            if replica.latency is None:
+                replica.latency = seconds
+            else:
+                replica.latency += _LATENCY_SMOOTHING * (seconds - replica.latency)
+
+    def check_health(self) -> Dict[str, bool]:
+        """Runs a trivial query on every replica, updating their status and latency, and returns whether each
+        replica (keyed to its URL) is up.
+        """
+        status = {}
+        for replica in self._replicas:
+            start = time.perf_counter()
+            try:
+                with replica.engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+            except sqlalchemy.exc.DBAPIError as exc:
+                self.mark_down(replica, exc)
+                status[replica.url] = False
+            else:
+                self.record_latency(replica, time.perf_counter() - start)
+                with self._lock:
+                    replica.down_until = 0.0
+                status[replica.url] = True
+        return status
+
+    def dispose(self) -> None:
+        """Disposes of the connection pool of every replica."""
+        for replica in self._replicas:
+            replica.engine.dispose()
+
+    def _get_candidates(self) -> List[_Replica]:
+        """Returns the available replicas in the order they should be tried."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [replica for replica in self._replicas if replica.down_until <= now]
+            if not candidates:
+                return []
+            if self._routing == 'least_latency':
+                # Replicas without any measurement yet go first so they get one
+                return sorted(candidates, key=lambda replica: replica.latency or 0.0)
+            start = next(self._counter) % len(candidates)
+            return candidates[start:] + candidates[:start]
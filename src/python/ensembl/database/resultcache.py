@@ -0,0 +1,175 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Query result cache.
+
+This module provides the least-recently-used cache of query results used by
+:class:`~ensembl.database.DBConnection` for databases that never change, e.g. released databases. The results
+are stored as :class:`~FrozenResult` objects, bounded by the size of their pickled form,
+and can optionally be persisted on disk to be shared across processes and runs.
+
+Typical usage example::
+
+    from ensembl.database import DBConnection
+    dbc = DBConnection('mysql://ensro@mysql-server:4242/mydb', immutable=True)
+    dbc.enable_result_cache(max_bytes=256 * 2**20, cache_dir='path/to/cache')
+    # Only the first execution hits the database
+    for _ in range(1000):
+        results = dbc.execute('SELECT * FROM analysis;')
+
+"""
+
+__all__ = ['ResultCache']
+
+import collections
+import logging
+import os
+from pathlib import Path
+import pickle
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+from sqlalchemy.engine import FrozenResult
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Least-recently-used cache of query results, bounded by size.
+
+    Args:
+        max_bytes: Maximum total size of the cached results kept in memory, measured as their pickled size.
+        cache_dir: Directory where to persist the cached results as well. Results evicted from memory are
+            still found there. Files are never deleted from this directory.
+
+    Attributes:
+        hits: Number of lookups that found the result in the cache.
+        misses: Number of lookups that did not.
+
+    """
+    def __init__(self, max_bytes: int = 64 * 2**20, cache_dir: Optional[Union[str, os.PathLike]] = None
+                 ) -> None:
+        self._max_bytes = max_bytes
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        if self._cache_dir:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+        # Cached results (and their size) keyed to their query key, from least to most recently used
+        self._entries = collections.OrderedDict()  # type: Dict[str, Tuple[FrozenResult, int]]
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        """Returns a string representation of this object."""
+        return f'{self.__class__.__name__}(entries={len(self)}, size={self._size})'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total size of the results cached in memory, in bytes."""
+        return self._size
+
+    def get(self, key: str) -> Optional[FrozenResult]:
+        """Returns the cached result for the given key, ``None`` if it is not in the cache.
+
+        Args:
+            key: Query key.
+
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        data = self._read(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            frozen = pickle.loads(data)
+            self._store(key, frozen, len(data))
+            return frozen
+
+    def put(self, key: str, frozen: FrozenResult) -> None:
+        """Adds the given result to the cache, evicting the least recently used ones if needed.
+
+        Args:
+            key: Query key.
+            frozen: Result to cache.
+
+        """
+        data = pickle.dumps(frozen, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store(key, frozen, len(data))
+        self._write(key, data)
+
+    def clear(self) -> None:
+        """Discards all the results cached in memory (persisted ones are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key: str, frozen: FrozenResult, size: int) -> None:
+        """Stores the given result in memory, evicting the least recently used ones to stay within the limit.
+
+        Args:
+            key: Query key.
+            frozen: Result to cache.
+            size: Pickled size of the result, in bytes.
+
+        """
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[1]
+        if size > self._max_bytes:
+            logger.debug(f"Result of {size} bytes exceeds the cache size: not kept in memory")
+            return
+        self._entries[key] = (frozen, size)
+        self._size += size
+        while self._size > self._max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """Returns the pickled result persisted for the given key, ``None`` if there is none.
+
+        Args:
+            key: Query key.
+
+        """
+        if not self._cache_dir:
+            return None
+        try:
+            return (self._cache_dir / f"{key}.pickle").read_bytes()
+        except OSError:
+            return None
+
+    def _write(self, key: str, data: bytes) -> None:
+        """Persists the given pickled result, if a cache directory was provided.
+
+        Args:
+            key: Query key.
+            data: Pickled result.
+
+        """
+        if not self._cache_dir:
+            return
+        # Write to a temporary file first so concurrent readers never find a partially written result
+        with tempfile.NamedTemporaryFile(dir=self._cache_dir, delete=False) as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_file.name, self._cache_dir / f"{key}.pickle")
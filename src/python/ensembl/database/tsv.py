@@ -0,0 +1,67 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tab-separated values (TSV) encoding of table rows.
+
+This module follows the format used by MySQL's ``LOAD DATA`` and ``SELECT ... INTO OUTFILE`` default options,
+i.e. the format of the ``<table_name>.txt`` dump files loaded by :class:`~ensembl.database.UnitTestDB`: fields
+separated by tabs, one row per line, ``NULL`` written as ``\\N``, and backslash, tab and newline characters
+escaped with a backslash.
+
+Typical usage example::
+
+    from ensembl.database.tsv import format_row
+    with open('my_table.txt', 'w') as tsv_file:
+        for row in dbc.execute('SELECT * FROM my_table'):
+            tsv_file.write(format_row(row))
+
+"""
+
+__all__ = ['NULL', 'format_value', 'format_row']
+
+from typing import Any, Iterable
+
+
+#: Representation of ``NULL`` values
+NULL = '\\N'
+
+_ESCAPE_TABLE = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
+
+def format_value(value: Any) -> str:
+    """Returns the TSV representation of the given value.
+
+    Args:
+        value: Value to format.
+
+    """
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, bytes):
+        value = value.decode()
+    elif isinstance(value, (set, frozenset)):
+        # MySQL SET columns are returned as Python sets
+        value = ','.join(sorted(value))
+    return str(value).translate(_ESCAPE_TABLE)
+
+
+def format_row(row: Iterable[Any]) -> str:
+    """Returns the TSV line (including the newline character) representing the given row.
+
+    Args:
+        row: Values of the row.
+
+    """
+    return '\t'.join(format_value(value) for value in row) + '\n'
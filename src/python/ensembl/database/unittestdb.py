@@ -24,23 +24,101 @@ Typical usage example::
     results = db.dbc.execute('SELECT * FROM my_table;')
     # At the end do not forget to drop the database:
     db.drop()
+    # In template mode, the database is cloned from a template database loaded only once per dump:
+    db = ensembl.database.UnitTestDB('mysql://ensro@mysql-server:4242/', 'path/to/dumps', template=True)
+    # Save the state of the database and bring it back after a test has modified it:
+    db.snapshot()
+    db.dbc.execute('DELETE FROM my_table;')
+    db.restore()
+    # In reuse mode, a database loaded from the same dump by a previous session is reused:
+    db = ensembl.database.UnitTestDB('mysql://ensro@mysql-server:4242/', 'path/to/dumps', reuse=True)
 
 """
 
 __all__ = ['UnitTestDB', 'UnitTestDBError', 'DataLoadingError']
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import gzip
+import hashlib
+import io
+import itertools
+import logging
 from pathlib import Path
 import os
 import re
-import subprocess
-from typing import Iterator, Union
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Dict, Generator, Iterator, List, Optional, Pattern, Sequence, Tuple, Union
 
 import sqlalchemy
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine.url import make_url
 from sqlalchemy_utils import database_exists
 
-from .dbconnection import DBConnection, Query, URL
+from .dbconnection import DBConnection, URL
+from .tsv import format_row
+
+
+logger = logging.getLogger(__name__)
+
+# View storing the checksum of the dump a reusable database or a complete template was loaded from (a view is
+# not listed as a table)
+_CHECKSUM_VIEW = 'unittestdb_dump_checksum'
+# Dialects that can clone a template database
+_TEMPLATE_DIALECTS = ('sqlite', 'mysql', 'postgresql')
+# Supported data file extensions, in order of preference if a table has several data files
+_DATA_FILE_SUFFIXES = ('.txt', '.txt.gz', '.txt.zst', '.parquet')
+# Number of rows inserted per executemany() call when loading SQLite tables
+_SQLITE_CHUNK_SIZE = 10000
+# Characters denoted by the escape sequences of MySQL's TSV format, e.g. "\t" (other escaped characters
+# stand for themselves)
+_TSV_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+_TSV_ESCAPE_SEQUENCE = re.compile(r'\\(.)', re.DOTALL)
+_TSV_ESCAPED_FIELD = re.compile(r'((?:[^\t\\]|\\.)*)\t', re.DOTALL)
+# Number of characters read at once when parsing SQL files
+_SQL_READ_SIZE = 2**16
+# Maximum number of tokens before the table name in a "CREATE TABLE" statement, i.e.
+# "CREATE TEMPORARY TABLE IF NOT EXISTS database . table"
+_SQL_HEAD_SIZE = 9
+_SQL_DELIMITER_COMMAND = re.compile(
+    r'[ \t]*DELIMITER[ \t]+(?P<new_delimiter>\S+)[^\n]*(?:\n|\Z)', re.IGNORECASE
+)
+# Quoted strings and identifiers, matching until the end of the text if unterminated
+_SQL_QUOTED = (
+    r"""'(?:[^'\\]|\\.|\\\Z|'')*(?:'|\Z)|"(?:[^"\\]|\\.|\\\Z|"")*(?:"|\Z)|`(?:[^`]|``)*(?:`|\Z)"""
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_sql_token_pattern(delimiter: str, coarse: bool = False) -> Pattern[str]:
+    """Returns the regular expression matching the next token of an SQL file with the given delimiter.
+
+    Unterminated comments and quoted tokens match until the end of the text, so the caller can tell they may
+    continue in the next chunk of the file.
+
+    Args:
+        delimiter: Statement delimiter.
+        coarse: Match any run of text without comments or delimiters (quoted strings and identifiers
+            included) as a single ``plain`` token, instead of separate ``space``, ``word`` and ``quoted``
+            tokens.
+
+    """
+    if coarse:
+        excluded = re.escape(''.join(sorted(set('\'"`#/-' + delimiter[0]))))
+        words = rf'(?P<plain>(?:[^{excluded}]+|-(?!-)|/(?![*/])|{_SQL_QUOTED})+)'
+    else:
+        words = rf'(?P<space>\s+)|(?P<word>\w+)|(?P<quoted>{_SQL_QUOTED})'
+    return re.compile(
+        # The delimiter takes precedence over comment markers, e.g. "DELIMITER //"
+        rf'(?P<delimiter>{re.escape(delimiter)})'
+        r'|(?P<comment>(?:--|\#|//)[^\n]*(?:\n|\Z)|/\*.*?(?:\*/|\Z))'
+        rf'|{words}'
+        r'|(?P<symbol>.)',
+        re.DOTALL
+    )
 
 
 class UnitTestDB:
@@ -51,12 +129,32 @@ class UnitTestDB:
             path URL, e.g. ``sqlite:////path/to/database/dir/``. The user needs to have write access to the
             server/directory.
         dump_dir: Directory path with the database schema in ``table.sql`` [mandatory] and the TSV data files
-            (without headers), one per table following the convention ``<table_name>.txt`` [optional].
+            (without headers), one per table following the convention ``<table_name>.txt`` [optional]. Data
+            files can also be compressed, i.e. ``<table_name>.txt.gz`` or ``<table_name>.txt.zst`` (requires
+            ``zstandard``), or in Parquet format, i.e. ``<table_name>.parquet`` (requires ``pyarrow``). These
+            are streamed into the database without writing any decompressed copy to disk, which is only
+            supported for MySQL and SQLite databases.
         name: Name to give to the new database. If not provided, the last directory name of `dump_dir` will be
             used instead. In either case, the new database name will be prefixed by the username.
+        num_workers: Maximum number of tables loaded concurrently, each through its own connection. SQLite
+            databases are always loaded one table at a time, as SQLite serialises all writes.
+        template: Clone the database from a template database instead of loading the dump. The template is
+            named after the checksum of the dump files (see :meth:`get_template_url()`) and loaded from the
+            dump only if it does not exist yet, under a temporary name renamed once complete so an interrupted
+            build is never cloned. Cloning copies the template file on SQLite, creates the database with
+            ``TEMPLATE`` on PostgreSQL and copies each table with ``CREATE TABLE ... LIKE`` and ``INSERT ...
+            SELECT`` on MySQL. Other dialects always load the dump, without building any template.
+        reuse: Reuse the database if it already exists and was loaded from the same dump, e.g. by a previous
+            test session, instead of dropping and reloading it. The checksum of the dump files is stored in
+            the view ``unittestdb_dump_checksum`` of the database. On SQLite and MySQL, a snapshot is taken
+            right after loading the dump and restored when the database is reused (see :meth:`restore()`), so
+            any change made since is undone. Databases of other dialects are reused as they are.
 
     Attributes:
         dbc (DBConnection): Database connection handler.
+        load_times (Dict[str, float]): Time (in seconds) taken to load the data of each table (empty if the
+            database has been cloned from a template or reused).
+        reused (bool): Whether an existing database has been reused.
 
     Raises:
         FileNotFoundError: If `dump_dir` is not an existing directory; or if the schema file ``table.sql`` is
@@ -64,37 +162,65 @@ class UnitTestDB:
 
     """
 
-    def __init__(self, url: URL, dump_dir: Union[str, os.PathLike], name: str = None) -> None:
+    def __init__(self, url: URL, dump_dir: Union[str, os.PathLike], name: str = None, num_workers: int = 4,
+                 template: bool = False, reuse: bool = False) -> None:
         db_url = make_url(url)
         dump_dir_path = Path(dump_dir)
         db_name = os.environ['USER'] + '_' + (name if name else dump_dir_path.name)
         # Add the database name to the URL
         db_url = db_url.set(database=db_name)
+        dialect = db_url.get_dialect().name
+        # Checksum of each table when the last snapshot was taken (MySQL only)
+        self._snapshot_checksums = None  # type: Optional[Dict[str, Optional[int]]]
+        self.reused = False
+        checksum = self._dump_checksum(dump_dir_path) if reuse else ''
+        if reuse and database_exists(db_url):
+            self.reused = self._reuse(url, db_url, checksum)
+            if self.reused:
+                logger.info(f"Reusing database {db_name}, loaded from the same dump {dump_dir}")
+                return
+        if template and dialect not in _TEMPLATE_DIALECTS:
+            logger.warning(f"Cannot clone template databases on {dialect}: loading the dump instead")
+            template = False
+        template_dbc = self._get_template(url, dump_dir_path, num_workers) if template else None
+        cloned = False
         # SQLite databases are created automatically if they do not exist
-        if db_url.get_dialect().name != 'sqlite':
+        if dialect != 'sqlite':
             # Connect to the server to create the database
             if not database_exists(db_url):
                 self._server = create_engine(url)
-                self._server.execute(text(f"CREATE DATABASE {db_url.database};"))
+                if template_dbc is not None and dialect == 'postgresql':
+                    # PostgreSQL creates the new database as a copy of the template
+                    template_dbc.dispose()
+                    self._server.execute(
+                        text(f"CREATE DATABASE {db_url.database} TEMPLATE {template_dbc.db_name};")
+                    )
+                    cloned = True
+                else:
+                    self._server.execute(text(f"CREATE DATABASE {db_url.database};"))
         try:
             # Establish the connection to the database, load the schema and import the data
-            self.dbc = DBConnection(db_url)
-            with self.dbc.begin() as conn:
-                for query in self._parse_sql_file(dump_dir_path / 'table.sql'):
-                    table = self._get_table_name(query)
-                    try:
-                        conn.execute(query)
-                    except sqlalchemy.exc.OperationalError:
-                        conn.execute(f"DROP TABLE IF EXISTS {table}")
-                        conn.execute(query)
-                    filepath = dump_dir_path / f"{table}.txt"
-                    if table and filepath.exists():
-                        conn.execute(f"TRUNCATE TABLE {table}")
-                        self._load_data(conn, table, filepath)
+            self.dbc = DBConnection(db_url, reflect=False)
+            self.load_times = {}  # type: Dict[str, float]
+            if template_dbc is not None and dialect in ('sqlite', 'mysql'):
+                self._clone_template(template_dbc)
+                cloned = True
+            elif not cloned:
+                self.load_times = self._load_dump(dump_dir_path, num_workers)
+            if cloned:
+                # The template's completion marker is copied along on SQLite and PostgreSQL
+                self.dbc.execute(text(f"DROP VIEW IF EXISTS {_CHECKSUM_VIEW}"))
+            if reuse:
+                self.dbc.execute(text(f"CREATE VIEW {_CHECKSUM_VIEW} AS SELECT '{checksum}' AS checksum"))
+                if dialect in ('sqlite', 'mysql'):
+                    self.snapshot()
         except:
             # Make sure the database is deleted before raising the exception
             self.drop()
             raise
+        finally:
+            if template_dbc is not None:
+                template_dbc.dispose()
         # Update the loaded metadata information of the database
         self.dbc.load_metadata()
 
@@ -102,16 +228,466 @@ class UnitTestDB:
         """Returns a string representation of this object."""
         return f"{self.__class__.__name__}({self.dbc.url!r})"
 
+    def _reuse(self, url: URL, db_url: sqlalchemy.engine.url.URL, checksum: str) -> bool:
+        """Connects to the existing database and returns whether it can be reused, i.e. whether it was
+        loaded from the dump with the given checksum and, on SQLite and MySQL, has a snapshot to restore. The
+        snapshot is restored if so, otherwise the database is dropped.
+
+        Args:
+            url: URL of the server hosting the database.
+            db_url: URL of the database.
+            checksum: Checksum of the dump files.
+
+        """
+        self.dbc = DBConnection(db_url, reflect=False)
+        self.load_times = {}
+        if db_url.get_dialect().name != 'sqlite':
+            self._server = create_engine(url)
+        try:
+            stored_checksum = self.dbc.execute(text(f"SELECT checksum FROM {_CHECKSUM_VIEW}")).scalar()
+        except sqlalchemy.exc.SQLAlchemyError:
+            stored_checksum = None
+        if stored_checksum == checksum:
+            if self.dbc.dialect not in ('sqlite', 'mysql'):
+                self.dbc.load_metadata()
+                return True
+            if self._find_snapshot():
+                self.restore()
+                return True
+        logger.info(f"Dropping database {self.dbc.db_name}: it was not loaded from the current dump")
+        self.drop()
+        return False
+
+    @classmethod
+    def get_template_url(cls, url: URL, dump_dir: Union[str, os.PathLike]) -> sqlalchemy.engine.url.URL:
+        """Returns the URL of the template database of the given dump, i.e. ``<user>_template_<checksum>``.
+
+        Args:
+            url: URL of the server hosting the template database.
+            dump_dir: Directory path with the database schema and the TSV data files.
+
+        """
+        db_name = f"{os.environ['USER']}_template_{cls._dump_checksum(Path(dump_dir))}"
+        return make_url(url).set(database=db_name)
+
+    @classmethod
+    def drop_template(cls, url: URL, dump_dir: Union[str, os.PathLike]) -> None:
+        """Drops the template database of the given dump, if it exists.
+
+        Args:
+            url: URL of the server hosting the template database.
+            dump_dir: Directory path with the database schema and the TSV data files.
+
+        """
+        template_url = cls.get_template_url(url, dump_dir)
+        if template_url.get_dialect().name == 'sqlite':
+            if os.path.exists(template_url.database):
+                os.remove(template_url.database)
+            return
+        server = create_engine(url)
+        try:
+            server.execute(text(f"DROP DATABASE IF EXISTS {template_url.database};"))
+        finally:
+            server.dispose()
+
+    @classmethod
+    def _get_template(cls, url: URL, dump_dir: Path, num_workers: int) -> DBConnection:
+        """Returns the connection handler of the template database of the given dump, loading the dump into
+        it first if it does not exist or is incomplete.
+
+        The dump is loaded into a process-specific database first, marked as complete with the
+        ``unittestdb_dump_checksum`` view and then renamed, so no process ever clones a partial template
+        (e.g. left by an interrupted build).
+
+        Args:
+            url: URL of the server hosting the template database.
+            dump_dir: Directory path with the database schema and the TSV data files.
+            num_workers: Maximum number of tables loaded concurrently.
+
+        """
+        template_url = cls.get_template_url(url, dump_dir)
+        if not cls._is_complete_template(template_url):
+            # The template database is named "<user>_template_<checksum>"
+            name = template_url.database[len(os.environ['USER']) + 1:]
+            checksum = name.rsplit('_', 1)[-1]
+            building = cls(url, dump_dir, f"{name}_{os.getpid()}", num_workers)
+            try:
+                building.dbc.execute(text(f"CREATE VIEW {_CHECKSUM_VIEW} AS SELECT '{checksum}' AS checksum"))
+                building.dbc.dispose()
+                cls._rename_template(url, building.dbc, template_url.database, checksum)
+            except:
+                building.drop()
+                raise
+            logger.info(f"Created template database {template_url.database} from {dump_dir}")
+        return DBConnection(template_url, reflect=False)
+
+    @staticmethod
+    def _is_complete_template(template_url: sqlalchemy.engine.url.URL) -> bool:
+        """Returns whether the template database exists and has been completely loaded.
+
+        Args:
+            template_url: URL of the template database.
+
+        """
+        if not database_exists(template_url):
+            return False
+        template_dbc = DBConnection(template_url, reflect=False)
+        try:
+            template_dbc.execute(text(f"SELECT checksum FROM {_CHECKSUM_VIEW}")).scalar()
+        except sqlalchemy.exc.SQLAlchemyError:
+            logger.warning(f"Template database {template_url.database} is incomplete: rebuilding it")
+            return False
+        finally:
+            template_dbc.dispose()
+        return True
+
+    @staticmethod
+    def _rename_template(url: URL, building_dbc: DBConnection, template_name: str, checksum: str) -> None:
+        """Replaces the template database by the given complete one.
+
+        Args:
+            url: URL of the server hosting both databases.
+            building_dbc: Connection handler of the complete template database, under a temporary name.
+            template_name: Name of the template database.
+            checksum: Checksum of the dump files.
+
+        """
+        if building_dbc.dialect == 'sqlite':
+            os.replace(building_dbc.db_name, template_name)
+            return
+        server = create_engine(url)
+        try:
+            server.execute(text(f"DROP DATABASE IF EXISTS {template_name};"))
+            if building_dbc.dialect == 'postgresql':
+                server.execute(text(f"ALTER DATABASE {building_dbc.db_name} RENAME TO {template_name};"))
+                return
+            # MySQL cannot rename databases: move all the tables at once, then add the completion marker
+            # (views cannot be moved to another database)
+            server.execute(text(f"CREATE DATABASE {template_name};"))
+            tables = ', '.join(
+                f"`{building_dbc.db_name}`.`{table}` TO `{template_name}`.`{table}`"
+                for table in building_dbc.tables
+            )
+            server.execute(text(f"RENAME TABLE {tables}"))
+            server.execute(
+                text(f"CREATE VIEW `{template_name}`.`{_CHECKSUM_VIEW}` AS SELECT '{checksum}' AS checksum")
+            )
+            server.execute(text(f"DROP DATABASE {building_dbc.db_name};"))
+        finally:
+            server.dispose()
+
+    def _clone_template(self, template_dbc: DBConnection) -> None:
+        """Copies the schema and data of the given template database into the database.
+
+        Args:
+            template_dbc: Connection handler of the template database, hosted by the same server.
+
+        """
+        if self.dbc.dialect == 'sqlite':
+            self.dbc.dispose()
+            shutil.copyfile(template_dbc.db_name, self.dbc.db_name)
+            return
+        with self.dbc.begin() as conn:
+            self._copy_mysql_tables(conn, template_dbc.db_name, self.dbc.db_name, list(template_dbc.tables))
+
+    @staticmethod
+    def _copy_mysql_tables(conn: sqlalchemy.engine.Connection, source_db: str, target_db: str,
+                           tables: List[str]) -> None:
+        """Replaces the given tables of the target database by a copy of the tables in the source database.
+
+        The foreign key checks are disabled during the copy, and enabled again before the connection is
+        returned to the pool.
+
+        Args:
+            conn: Connection to the MySQL server hosting both databases.
+            source_db: Name of the database to copy the tables from.
+            target_db: Name of the database to copy the tables into.
+            tables: Table names.
+
+        """
+        conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        try:
+            for table in tables:
+                source = f"`{source_db}`.`{table}`"
+                target = f"`{target_db}`.`{table}`"
+                conn.execute(text(f"DROP TABLE IF EXISTS {target}"))
+                conn.execute(text(f"CREATE TABLE {target} LIKE {source}"))
+                conn.execute(text(f"INSERT INTO {target} SELECT * FROM {source}"))
+        finally:
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+    @staticmethod
+    def _dump_checksum(dump_dir: Path) -> str:
+        """Returns the checksum of the names and contents of all the files in the given dump directory.
+
+        Args:
+            dump_dir: Directory path with the database schema and the TSV data files.
+
+        Raises:
+            FileNotFoundError: If `dump_dir` is not an existing directory.
+
+        """
+        checksum = hashlib.sha1()
+        for filepath in sorted(path for path in dump_dir.iterdir() if path.is_file()):
+            checksum.update(filepath.name.encode())
+            with filepath.open('rb') as dump_file:
+                for chunk in iter(lambda: dump_file.read(2**20), b''):
+                    checksum.update(chunk)
+        return checksum.hexdigest()[:16]
+
+    def _load_dump(self, dump_dir: Path, num_workers: int) -> Dict[str, float]:
+        """Creates the tables of the given dump and loads their data, returning the time taken by each table.
+
+        Args:
+            dump_dir: Directory path with the database schema and the TSV data files.
+            num_workers: Maximum number of tables loaded concurrently.
+
+        """
+        tables = []
+        with self.dbc.begin() as conn:
+            for query, table in self._parse_sql_file(dump_dir / 'table.sql'):
+                try:
+                    conn.execute(query)
+                except sqlalchemy.exc.OperationalError:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.execute(query)
+                if table:
+                    tables.append(table)
+        # Reflect the new schema to know the foreign keys between tables
+        self.dbc.load_metadata()
+        data_files = {}
+        for table in tables:
+            filepath = self._get_data_file(dump_dir, table)
+            if filepath:
+                data_files[table] = filepath
+        if self.dbc.dialect == 'sqlite':
+            num_workers = 1
+        return self._load_tables(data_files, num_workers)
+
     def drop(self) -> None:
-        """Drops the database."""
+        """Drops the database and its snapshot, if any."""
         if self.dbc.dialect == 'sqlite':
             os.remove(self.dbc.db_name)
+            if os.path.exists(self._snapshot_name):
+                os.remove(self._snapshot_name)
         elif self.dbc.dialect == 'oracle':
             self._server.execute(text(f"DROP DATABASE {self.dbc.db_name};"))
         else:
+            if self.dbc.dialect == 'mysql':
+                self._server.execute(text(f"DROP DATABASE IF EXISTS {self._snapshot_name};"))
             self._server.execute(text(f"DROP DATABASE IF EXISTS {self.dbc.db_name};"))
         self.dbc.dispose()
 
+    def snapshot(self) -> None:
+        """Saves the current state of the database, so it can be brought back later with :meth:`restore()`.
+
+        On SQLite, the database file is copied next to it. On MySQL, every table is copied into the database
+        ``<name>_snapshot`` and its checksum (``CHECKSUM TABLE``) is recorded. Taking a new snapshot replaces
+        the previous one.
+
+        Raises:
+            UnitTestDBError: If the database is neither SQLite nor MySQL.
+
+        """
+        if self.dbc.dialect == 'sqlite':
+            self.dbc.dispose()
+            shutil.copyfile(self.dbc.db_name, self._snapshot_name)
+        elif self.dbc.dialect == 'mysql':
+            with self.dbc.begin() as conn:
+                conn.execute(text(f"DROP DATABASE IF EXISTS `{self._snapshot_name}`"))
+                conn.execute(text(f"CREATE DATABASE `{self._snapshot_name}`"))
+                tables = self._get_mysql_tables(conn, self.dbc.db_name)
+                self._copy_mysql_tables(conn, self.dbc.db_name, self._snapshot_name, tables)
+                self._snapshot_checksums = self._get_mysql_checksums(conn, self.dbc.db_name, tables)
+        else:
+            raise UnitTestDBError(f"Snapshots are not supported for {self.dbc.dialect} databases")
+        logger.debug(f"Took snapshot of {self.dbc.db_name}")
+
+    def restore(self) -> None:
+        """Brings the database back to the state saved by the last :meth:`snapshot()`.
+
+        On SQLite, the snapshot file is copied back over the database file. On MySQL, only the tables whose
+        checksum differs from the one recorded by the snapshot, or that have been dropped, are copied back
+        from the snapshot database, and the tables created after the snapshot are dropped. Note that the
+        checksum only covers the table data: schema changes that do not alter it (e.g. a new index) are not
+        undone.
+
+        Raises:
+            UnitTestDBError: If no snapshot has been taken.
+
+        """
+        if self.dbc.dialect == 'sqlite':
+            if not os.path.exists(self._snapshot_name):
+                raise UnitTestDBError(f"No snapshot of {self.dbc.db_name} has been taken")
+            self.dbc.dispose()
+            shutil.copyfile(self._snapshot_name, self.dbc.db_name)
+            logger.debug(f"Restored {self.dbc.db_name} from its snapshot")
+        else:
+            if self._snapshot_checksums is None:
+                raise UnitTestDBError(f"No snapshot of {self.dbc.db_name} has been taken")
+            with self.dbc.begin() as conn:
+                tables = self._get_mysql_tables(conn, self.dbc.db_name)
+                checksums = self._get_mysql_checksums(conn, self.dbc.db_name, tables)
+                for table in set(tables) - set(self._snapshot_checksums):
+                    conn.execute(text(f"DROP TABLE `{table}`"))
+                restored = [
+                    table for table, checksum in self._snapshot_checksums.items()
+                    if checksums.get(table) != checksum
+                ]
+                self._copy_mysql_tables(conn, self._snapshot_name, self.dbc.db_name, restored)
+            logger.debug(f"Restored tables {restored} of {self.dbc.db_name} from its snapshot")
+        self.dbc.load_metadata()
+
+    def _find_snapshot(self) -> bool:
+        """Returns whether the database has a snapshot, e.g. taken by a previous session, to restore.
+
+        On MySQL, the checksums of the snapshot tables are computed again, as they are only kept in memory.
+
+        """
+        if self.dbc.dialect == 'sqlite':
+            return os.path.exists(self._snapshot_name)
+        if self._snapshot_checksums is None:
+            with self.dbc.connect() as conn:
+                query = text("SELECT 1 FROM information_schema.SCHEMATA WHERE SCHEMA_NAME = :name")
+                if conn.execute(query, {'name': self._snapshot_name}).scalar() is None:
+                    return False
+                tables = self._get_mysql_tables(conn, self._snapshot_name)
+                self._snapshot_checksums = self._get_mysql_checksums(conn, self._snapshot_name, tables)
+        return True
+
+    @property
+    def _snapshot_name(self) -> str:
+        """Name of the snapshot database (MySQL) or file path (SQLite)."""
+        if self.dbc.dialect == 'sqlite':
+            return f"{self.dbc.db_name}.snapshot"
+        return f"{self.dbc.db_name}_snapshot"
+
+    @staticmethod
+    def _get_mysql_tables(conn: sqlalchemy.engine.Connection, db_name: str) -> List[str]:
+        """Returns the names of the base tables (i.e. excluding views) of the given MySQL database.
+
+        Args:
+            conn: Connection to the MySQL server hosting the database.
+            db_name: Database name.
+
+        """
+        result = conn.execute(text(f"SHOW FULL TABLES FROM `{db_name}` WHERE Table_type = 'BASE TABLE'"))
+        return [row[0] for row in result]
+
+    @staticmethod
+    def _get_mysql_checksums(conn: sqlalchemy.engine.Connection, db_name: str, tables: List[str]
+                             ) -> Dict[str, Optional[int]]:
+        """Returns the checksum of the data of each given table of the MySQL database.
+
+        Args:
+            conn: Connection to the MySQL server hosting the database.
+            db_name: Database name.
+            tables: Table names.
+
+        """
+        if not tables:
+            return {}
+        table_list = ', '.join(f"`{db_name}`.`{table}`" for table in tables)
+        result = conn.execute(text(f"CHECKSUM TABLE {table_list}"))
+        # The first column is the qualified table name, i.e. "<db_name>.<table>"
+        return {row[0][len(db_name) + 1:]: row[1] for row in result}
+
+    def _load_tables(self, data_files: Dict[str, Path], num_workers: int) -> Dict[str, float]:
+        """Loads the data of each table concurrently and returns the time (in seconds) taken by each one.
+
+        The tables are loaded in waves so every table referenced by a foreign key is loaded before the tables
+        referencing it. Tables in (or depending on) a foreign key cycle have no such order: they are loaded
+        last, one after the other through a single connection with the foreign key checks disabled (MySQL
+        only).
+
+        Args:
+            data_files: Data file path of each table to load.
+            num_workers: Maximum number of tables loaded concurrently.
+
+        """
+        load_times = {}
+        start = time.perf_counter()
+        waves, cyclic_tables = self._get_loading_waves(list(data_files))
+        with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+            for wave in waves:
+                futures = {
+                    executor.submit(self._load_table, table, data_files[table]): table for table in wave
+                }
+                for future in as_completed(futures):
+                    table = futures[future]
+                    load_times[table] = future.result()
+                    logger.info(f"Loaded table '{table}' in {load_times[table]:.2f}s")
+        if cyclic_tables:
+            # Foreign key checks are a session setting: load every table through the same connection
+            with self.dbc.connect() as conn:
+                if self.dbc.dialect == 'mysql':
+                    conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+                try:
+                    for table in cyclic_tables:
+                        table_start = time.perf_counter()
+                        with conn.begin():
+                            self._load_data(conn, table, data_files[table])
+                        load_times[table] = time.perf_counter() - table_start
+                        logger.info(f"Loaded table '{table}' in {load_times[table]:.2f}s")
+                finally:
+                    if self.dbc.dialect == 'mysql':
+                        conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+        logger.info(f"Loaded {len(load_times)} tables in {time.perf_counter() - start:.2f}s")
+        return load_times
+
+    def _get_loading_waves(self, tables: List[str]) -> Tuple[List[List[str]], List[str]]:
+        """Returns the given tables grouped in waves, each one only referencing tables of previous waves, and
+        the remaining tables, which are in or reference a foreign key cycle.
+
+        Args:
+            tables: Table names.
+
+        """
+        pending = set(tables)
+        dependencies = {
+            table: {
+                fk.column.table.name for fk in self.dbc.tables[table].foreign_keys
+                if fk.column.table.name in pending and fk.column.table.name != table
+            }
+            for table in tables
+        }
+        waves = []
+        while pending:
+            wave = sorted(table for table in pending if not dependencies[table] & pending)
+            if not wave:
+                break
+            waves.append(wave)
+            pending.difference_update(wave)
+        return waves, sorted(pending)
+
+    def _load_table(self, table: str, filepath: Path) -> float:
+        """Loads the table data from the given file in its own transaction and returns the time it took.
+
+        Args:
+            table: Table name to load the data to.
+            filepath: File path with the data in TSV format (without headers).
+
+        """
+        start = time.perf_counter()
+        with self.dbc.begin() as conn:
+            self._load_data(conn, table, filepath)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _get_data_file(dump_dir: Path, table: str) -> Optional[Path]:
+        """Returns the data file of the given table in the dump, ``None`` if there is none.
+
+        Args:
+            dump_dir: Directory path with the database schema and the data files.
+            table: Table name.
+
+        """
+        for suffix in _DATA_FILE_SUFFIXES:
+            filepath = dump_dir / f"{table}{suffix}"
+            if filepath.exists():
+                return filepath
+        return None
+
     def _load_data(self, conn: sqlalchemy.engine.Connection, table: str, filepath: Union[str, os.PathLike]
                   ) -> None:
         """Loads the table data from the given file.
@@ -119,21 +695,49 @@ class UnitTestDB:
         Args:
             conn: Open connection to the database.
             table: Table name to load the data to.
-            filepath: File path with the data in TSV format (without headers).
+            filepath: File path with the data in TSV format (without headers), optionally compressed, or in
+                Parquet format.
 
         Raises:
-            UnitTestDBError: if ``.import`` command fails (SQLite databases only).
+            DataLoadingError: If a row does not have as many fields as the table has columns (SQLite databases
+                only); or if the file is compressed or in Parquet format and the database is neither MySQL
+                nor SQLite.
 
         """
         if self.dbc.dialect == 'sqlite':
-            # SQLite does not have an equivalent to "LOAD DATA": use its '.import' command instead
-            try:
-                subprocess.run(
-                    ['sqlite3', self.dbc.db_name, ".mode tabs", f".import {filepath} {table}"],
-                    check=True
+            # SQLite does not have an equivalent to "LOAD DATA": parse the file and insert its rows instead
+            self._load_sqlite_data(conn, table, filepath)
+        elif not str(filepath).endswith('.txt'):
+            if self.dbc.dialect != 'mysql':
+                raise DataLoadingError(
+                    f"Cannot load '{filepath}': only plain TSV files are supported for {self.dbc.dialect}"
+                )
+            # Stream the decoded data through a named pipe, so no decompressed copy is written to disk
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                fifo_path = os.path.join(tmp_dir, f"{table}.txt")
+                os.mkfifo(fifo_path)
+                cancelled = threading.Event()
+                writer = threading.Thread(
+                    target=self._write_fifo, args=(filepath, fifo_path, cancelled), daemon=True
                 )
-            except subprocess.CalledProcessError:
-                raise DataLoadingError(f"SQLite3 import of '{filepath}' failed") from None
+                writer.start()
+                try:
+                    conn.execute(text(f"LOAD DATA LOCAL INFILE '{fifo_path}' INTO TABLE {table}"))
+                finally:
+                    if writer.is_alive():
+                        # The load failed: stop the writer, draining the pipe in case it is blocked on it
+                        cancelled.set()
+                        fifo = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+                        try:
+                            while writer.is_alive():
+                                try:
+                                    drained = os.read(fifo, 2**16)
+                                except BlockingIOError:
+                                    drained = b''
+                                if not drained:
+                                    writer.join(0.01)
+                        finally:
+                            os.close(fifo)
         elif self.dbc.dialect == 'postgresql':
             conn.execute(text(f"COPY {table} FROM '{filepath}'"))
         elif self.dbc.dialect == 'sqlserver':
@@ -141,46 +745,292 @@ class UnitTestDB:
         else:
             conn.execute(text(f"LOAD DATA LOCAL INFILE '{filepath}' INTO TABLE {table}"))
 
+    def _load_sqlite_data(self, conn: sqlalchemy.engine.Connection, table: str,
+                          filepath: Union[str, os.PathLike]) -> None:
+        """Loads the table data from the given file into an SQLite database, in chunks of rows.
+
+        Args:
+            conn: Open connection to the database.
+            table: Table name to load the data to.
+            filepath: File path with the data in TSV format (without headers).
+
+        Raises:
+            DataLoadingError: If a row does not have as many fields as the table has columns.
+
+        """
+        num_columns = len(self.dbc.tables[table].columns)
+        statement = f'INSERT INTO "{table}" VALUES ({", ".join(["?"] * num_columns)})'
+        # Use the DBAPI cursor directly: it takes the parsed rows as they are, within the same transaction
+        cursor = conn.connection.cursor()
+        try:
+            # Both settings only last as long as the connection, and the database is meant to be disposable
+            cursor.execute("PRAGMA journal_mode = MEMORY")
+            cursor.execute("PRAGMA synchronous = OFF")
+            for rows in self._read_data_file(filepath, _SQLITE_CHUNK_SIZE):
+                if any(len(row) != num_columns for row in rows):
+                    row = next(row for row in rows if len(row) != num_columns)
+                    raise DataLoadingError(
+                        f"Row {row} of '{filepath}' has {len(row)} fields, expected {num_columns}"
+                    )
+                cursor.executemany(statement, rows)
+        finally:
+            cursor.close()
+
+    @classmethod
+    def _write_fifo(cls, filepath: Union[str, os.PathLike], fifo_path: str,
+                    cancelled: Optional[threading.Event] = None) -> None:
+        """Writes the content of the given data file, decompressed and in TSV format, to the given named pipe.
+
+        Args:
+            filepath: File path with the data in TSV format (without headers), optionally compressed, or in
+                Parquet format.
+            fifo_path: Named pipe path.
+            cancelled: Event to stop writing early.
+
+        """
+        chunks = cls._read_tsv_chunks(filepath)
+        try:
+            with open(fifo_path, 'wb') as fifo:
+                for chunk in chunks:
+                    if cancelled is not None and cancelled.is_set():
+                        break
+                    fifo.write(chunk)
+        except BrokenPipeError:
+            logger.debug(f"Named pipe for '{filepath}' closed before all the data was read")
+        finally:
+            chunks.close()
+
+    @classmethod
+    def _read_tsv_chunks(cls, filepath: Union[str, os.PathLike]) -> Generator[bytes, None, None]:
+        """Yields the content of the given data file, decompressed and in TSV format, in chunks of bytes.
+
+        Args:
+            filepath: File path with the data in TSV format (without headers), optionally compressed, or in
+                Parquet format.
+
+        """
+        if str(filepath).endswith('.parquet'):
+            for rows in cls._read_parquet_file(filepath, _SQLITE_CHUNK_SIZE):
+                yield ''.join(format_row(row) for row in rows).encode()
+        else:
+            with cls._open_data_file(filepath) as data_file:
+                yield from iter(lambda: data_file.read(2**20), b'')
+
+    @classmethod
+    def _read_data_file(cls, filepath: Union[str, os.PathLike], chunk_size: int = _SQLITE_CHUNK_SIZE
+                        ) -> Iterator[List[Sequence[Any]]]:
+        """Yields the rows of the given data file, in chunks of up to `chunk_size` rows.
+
+        Args:
+            filepath: File path with the data in TSV format (without headers), optionally compressed, or in
+                Parquet format.
+            chunk_size: Maximum number of rows read at once.
+
+        """
+        if str(filepath).endswith('.parquet'):
+            return cls._read_parquet_file(filepath, chunk_size)
+        return cls._parse_tsv_file(filepath, chunk_size)
+
+    @staticmethod
+    def _read_parquet_file(filepath: Union[str, os.PathLike], chunk_size: int = _SQLITE_CHUNK_SIZE
+                           ) -> Iterator[List[Sequence[Any]]]:
+        """Yields the rows of the given Parquet file, in chunks of up to `chunk_size` rows.
+
+        Decimal and temporal values are returned as strings, as they would be found in a TSV file.
+
+        Args:
+            filepath: File path with the data in Parquet format.
+            chunk_size: Maximum number of rows read at once.
+
+        """
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+        parquet_file = pyarrow.parquet.ParquetFile(str(filepath))
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            columns = []
+            for column in batch.columns:
+                if pyarrow.types.is_decimal(column.type) or pyarrow.types.is_temporal(column.type):
+                    column = column.cast(pyarrow.string())
+                columns.append(column.to_pylist())
+            yield list(zip(*columns))
+
+    @staticmethod
+    def _open_data_file(filepath: Union[str, os.PathLike]) -> BinaryIO:
+        """Returns the given TSV data file opened for reading in binary mode, decompressing it on the fly if
+        it is compressed with gzip (``.gz``) or Zstandard (``.zst``).
+
+        Args:
+            filepath: File path with the data in TSV format (without headers), optionally compressed.
+
+        """
+        if str(filepath).endswith('.gz'):
+            return gzip.open(filepath, 'rb')
+        if str(filepath).endswith('.zst'):
+            import zstandard  # pylint: disable=import-outside-toplevel
+            return zstandard.ZstdDecompressor().stream_reader(open(filepath, 'rb'), closefd=True)
+        return open(filepath, 'rb')
+
+    @classmethod
+    def _parse_tsv_file(cls, filepath: Union[str, os.PathLike], chunk_size: int = _SQLITE_CHUNK_SIZE
+                        ) -> Iterator[List[List[Optional[str]]]]:
+        """Yields the rows found parsing the given TSV file, as written by MySQL's
+        ``SELECT ... INTO OUTFILE``, in chunks of up to `chunk_size` lines.
+
+        Fields are unescaped (e.g. ``\\t`` becomes a tab) and ``\\N`` is returned as ``None``. Escaped line
+        breaks are part of the field, not the end of the row.
+
+        Args:
+            filepath: File path with the data in TSV format (without headers), optionally compressed.
+            chunk_size: Maximum number of lines parsed at once.
+
+        """
+        with io.TextIOWrapper(cls._open_data_file(filepath), encoding='utf-8', newline='\n') as tsv_file:
+            while True:
+                lines = list(itertools.islice(tsv_file, chunk_size))
+                if not lines:
+                    return
+                if any(line.endswith('\\\n') for line in lines):
+                    lines = cls._join_escaped_line_breaks(lines, tsv_file)
+                yield [
+                    cls._parse_tsv_line(line) if '\\' in line
+                    else (line[:-1] if line.endswith('\n') else line).split('\t')
+                    for line in lines
+                ]
+
+    @staticmethod
+    def _join_escaped_line_breaks(lines: List[str], tsv_file: Iterator[str]) -> List[str]:
+        """Returns the given lines, joining each line ending with an escaped line break with the next one.
+
+        Args:
+            lines: Lines read from the TSV file.
+            tsv_file: TSV file the lines come from, to read the rest of the last row if needed.
+
+        """
+        def is_escaped(line: str) -> bool:
+            # A line break preceded by an odd number of backslashes is part of the field
+            return line.endswith('\n') and (len(line) - 1 - len(line[:-1].rstrip('\\'))) % 2 == 1
+
+        joined = []  # type: List[str]
+        row = ''
+        for line in itertools.chain(lines, tsv_file):
+            row += line
+            if not is_escaped(row):
+                joined.append(row)
+                row = ''
+                if len(joined) >= len(lines):
+                    break
+        if row:
+            joined.append(row)
+        return joined
+
     @staticmethod
-    def _parse_sql_file(filepath: Union[str, bytes, os.PathLike]
-                       ) -> Iterator[sqlalchemy.sql.expression.TextClause]:
-        """Yields each SQL query found parsing the given SQL file.
+    def _parse_tsv_line(line: str) -> List[Optional[str]]:
+        """Returns the unescaped fields of the given TSV line.
+
+        Args:
+            line: Line of a TSV file, which may contain escape sequences.
+
+        """
+        fields = (line[:-1] if line.endswith('\n') else line).split('\t')
+        if all(field == '\\N' or '\\' not in field for field in fields):
+            # Most escaped lines only have "\N" fields, which do not need the full parsing
+            return [None if field == '\\N' else field for field in fields]
+        # Terminate the last field like the others, so every field is followed by a tab
+        line = (line[:-1] if line.endswith('\n') else line) + '\t'
+        return [
+            None if field == '\\N' else _TSV_ESCAPE_SEQUENCE.sub(
+                lambda match: _TSV_ESCAPES.get(match.group(1), match.group(1)), field
+            ) for field in _TSV_ESCAPED_FIELD.findall(line)
+        ]
+
+    @classmethod
+    def _parse_sql_file(cls, filepath: Union[str, bytes, os.PathLike]
+                        ) -> Iterator[Tuple[sqlalchemy.sql.expression.TextClause, str]]:
+        """Yields each SQL query found parsing the given SQL file, along with the name of the table it creates
+        (empty string if it is not a ``CREATE TABLE`` query).
+
+        The file is read in chunks and tokenised in a single pass: comments are discarded, whilst quoted
+        strings and identifiers are kept as they are, even if they contain the statement delimiter or comment
+        markers. ``DELIMITER`` commands change the delimiter of the following statements.
 
         Args:
             filepath: SQL file path.
 
         """
-        comment_block_start = re.compile(r'\/\*\*')
-        comment_block_end = re.compile(r'\*\/$')
-        single_comment = re.compile(r'(--|#|\/\/).*')
-        inline_comment = re.compile(r'\/\*[^\*]*\*\/')
+        patterns = (_get_sql_token_pattern(';'), _get_sql_token_pattern(';', coarse=True))
         with open(filepath) as sql_file:
-            query = []
-            multiline_comment = False
-            for line in sql_file:
-                line = line.strip(' \n')
-                # Capture (and discard) multiple-line comments
-                if comment_block_start.match(line):
-                    multiline_comment = True
-                    continue
-                if comment_block_end.search(line):
-                    multiline_comment = False
+            buffer = ''
+            pos = 0
+            eof = False
+            parts = []  # type: List[str]
+            # First words, quoted tokens and symbols of the statement, enough to find the name of a created
+            # table. The rest of the statement is tokenised coarsely, as only comments and delimiters matter.
+            head = []  # type: List[str]
+            fine = True
+            while True:
+                # "DELIMITER" commands can only be found between statements, and span the whole line
+                between = not parts
+                match = _SQL_DELIMITER_COMMAND.match(buffer, pos) if between else None
+                if match is None:
+                    match = patterns[0 if fine else 1].match(buffer, pos)
+                if match is None or (not eof and (match.end() == len(buffer)
+                                                  or (between and buffer.find('\n', pos) < 0))):
+                    # The token may continue in the next chunk of the file
+                    if eof:
+                        break
+                    chunk = sql_file.read(_SQL_READ_SIZE)
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
                     continue
-                if not multiline_comment:
-                    # Remove single- and in-line comments
-                    line = single_comment.sub('', line)
-                    line = inline_comment.sub('', line)
-                    if line:
-                        query.append(line)
-                        if line.endswith(';'):
-                            yield text(' '.join(query))
-                            query = []
+                pos = match.end()
+                kind = match.lastgroup
+                if kind == 'new_delimiter':
+                    delimiter = match.group(kind)
+                    patterns = (_get_sql_token_pattern(delimiter), _get_sql_token_pattern(delimiter, True))
+                elif kind == 'delimiter':
+                    statement = ''.join(parts).strip()
+                    if statement:
+                        yield text(statement), cls._get_table_name(head)
+                    parts = []
+                    head = []
+                    fine = True
+                elif kind in ('comment', 'space'):
+                    # Skip them between statements, so a following "DELIMITER" command is still recognised
+                    if parts:
+                        parts.append(' ' if kind == 'comment' else match.group())
+                elif kind == 'plain':
+                    parts.append(match.group())
+                else:
+                    parts.append(match.group())
+                    head.append(match.group())
+                    # Only the start of "CREATE" statements needs to be tokenised finely
+                    fine = len(head) < _SQL_HEAD_SIZE and head[0].upper() == 'CREATE'
+            statement = ''.join(parts).strip()
+            if statement:
+                yield text(statement), cls._get_table_name(head)
 
     @staticmethod
-    def _get_table_name(query: Query) -> str:
-        """Returns the table name of a ``CREATE TABLE`` SQL query, empty string otherwise."""
-        match = re.search(r'^CREATE[ ]+TABLE[ ]+(`[^`]+`|[^ ]+)', str(query))
-        return match.group(1).strip('`') if match else ''
+    def _get_table_name(tokens: List[str]) -> str:
+        """Returns the table name of a ``CREATE TABLE`` SQL query, empty string otherwise.
+
+        Args:
+            tokens: First tokens of the query, excluding whitespaces and comments.
+
+        """
+        words = [token.upper() for token in tokens]
+        start = 3 if words[1:2] == ['TEMPORARY'] else 2
+        if words[:1] != ['CREATE'] or words[start - 1:start] != ['TABLE']:
+            return ''
+        if words[start:start + 3] == ['IF', 'NOT', 'EXISTS']:
+            start += 3
+        name = tokens[start:start + 3]
+        if not name:
+            return ''
+        # Discard the database name, if any
+        name = name[2] if len(name) == 3 and name[1] == '.' else name[0]
+        return name[1:-1].replace(name[0] * 2, name[0]) if name[0] in '`"' else name
 
 
 class UnitTestDBError(Exception):
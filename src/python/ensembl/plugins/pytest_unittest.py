@@ -48,6 +48,9 @@ def pytest_addoption(parser: Parser) -> None:
                     help="URL to the server where to create the test database(s).")
     group.addoption('--keep-data', action='store_true', dest='keep_data',
                     help="Do not remove test databases/temporary directories. Default: False")
+    group.addoption('--reuse-data', action='store_true', dest='reuse_data',
+                    help="Reuse the test databases of a previous session if their dumps have not changed, "
+                         "and keep them at the end of the session. Default: False")
 
 
 def pytest_configure(config: Config) -> None:
@@ -97,6 +100,7 @@ def db_factory_(request: FixtureRequest) -> Generator:
     """
     created = {}  # type: Dict[str, UnitTestDB]
     server_url = request.config.getoption('server')
+    reuse = request.config.getoption('reuse_data')
     def db_factory(src: os.PathLike, name: Optional[str] = None) -> UnitTestDB:
         """Returns a unit test database (:class:`UnitTestDB`) object.
 
@@ -108,10 +112,12 @@ def db_factory_(request: FixtureRequest) -> Generator:
         """
         src_path = Path(src) if os.path.isabs(src) else pytest.dbs_dir / src
         db_key = name if name else src_path.name
-        return created.setdefault(db_key, UnitTestDB(server_url, src_path, name))
+        if db_key not in created:
+            created[db_key] = UnitTestDB(server_url, src_path, name, reuse=reuse)
+        return created[db_key]
     yield db_factory
-    # Drop all unit test databases unless the user has requested to keep them
-    if not request.config.getoption('keep_data'):
+    # Drop all unit test databases unless the user has requested to keep (or reuse) them
+    if not (request.config.getoption('keep_data') or reuse):
         for test_db in created.values():
             test_db.drop()
 
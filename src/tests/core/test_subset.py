@@ -0,0 +1,68 @@
+# See the NOTICE file distributed with this work for additional information
+# regarding copyright ownership.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit testing of :mod:`core.subset` module.
+
+Typical usage example::
+
+    $ pytest test_subset.py
+
+"""
+
+from pathlib import Path
+
+import pytest
+from _pytest.fixtures import FixtureRequest
+
+from ensembl.core.subset import Subset
+from ensembl.database import UnitTestDB
+
+
+@pytest.mark.parametrize("db", [{'src': 'core_db'}], indirect=True)
+class TestSubset:
+    """Tests :class:`Subset` class."""
+
+    def test_write(self, request: FixtureRequest, db: UnitTestDB, tmp_path: Path) -> None:
+        """Tests that the subset seeded with the genes of a seq_region is consistent and loadable.
+
+        Args:
+            request: Access to the requesting test context.
+            db: Generator of unit test database (fixture).
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        subset = Subset(db.dbc, batch_size=2)
+        subset.add_seed('gene', 'seq_region_id = 1')
+        with pytest.raises(KeyError):
+            subset.add_seed('no_table')
+        num_rows = subset.write(tmp_path)
+        assert num_rows == {
+            'analysis': 2, 'attrib_type': 2, 'coord_system': 1, 'exon': 2, 'exon_transcript': 3,
+            'external_db': 2, 'gene': 1, 'gene_attrib': 2, 'meta': 2, 'object_xref': 2, 'seq_region': 1,
+            'transcript': 2, 'translation': 1, 'xref': 2,
+        }
+        subset_db = UnitTestDB(request.config.getoption('server'), tmp_path, 'subset_db')
+        try:
+            dbc = subset_db.dbc
+            assert set(dbc.tables) == set(db.dbc.tables)
+            # Gene 3 shares its display xref with gene 1, but xrefs do not pull the rows referring to them
+            assert dbc.execute("SELECT gene_id FROM gene").fetchall() == [(1,)]
+            assert dbc.execute("SELECT transcript_id FROM transcript ORDER BY 1").fetchall() == [(1,), (2,)]
+            assert dbc.execute("SELECT exon_id FROM exon ORDER BY 1").fetchall() == [(1,), (2,)]
+            # Object xrefs are followed through their ensembl_object_type and ensembl_id columns
+            query = "SELECT object_xref_id FROM object_xref ORDER BY 1"
+            assert dbc.execute(query).fetchall() == [(1,), (3,)]
+            assert dbc.execute("SELECT xref_id FROM xref ORDER BY 1").fetchall() == [(1,), (2,)]
+            assert dbc.execute("SELECT seq_region_id FROM seq_region").fetchall() == [(1,)]
+        finally:
+            subset_db.drop()
@@ -0,0 +1,103 @@
+CREATE TABLE `analysis` (
+    `analysis_id`   INTEGER NOT NULL,
+    `logic_name`    VARCHAR(128) NOT NULL,
+    PRIMARY KEY (`analysis_id`)
+);
+
+CREATE TABLE `attrib_type` (
+    `attrib_type_id`    INTEGER NOT NULL,
+    `code`              VARCHAR(20) NOT NULL DEFAULT '',
+    PRIMARY KEY (`attrib_type_id`)
+);
+
+CREATE TABLE `coord_system` (
+    `coord_system_id`   INTEGER NOT NULL,
+    `species_id`        INTEGER NOT NULL DEFAULT 1,
+    `name`              VARCHAR(40) NOT NULL,
+    PRIMARY KEY (`coord_system_id`)
+);
+
+CREATE TABLE `exon` (
+    `exon_id`           INTEGER NOT NULL,
+    `seq_region_id`     INTEGER NOT NULL,
+    `stable_id`         VARCHAR(128) DEFAULT NULL,
+    PRIMARY KEY (`exon_id`)
+);
+
+CREATE TABLE `exon_transcript` (
+    `exon_id`           INTEGER NOT NULL,
+    `transcript_id`     INTEGER NOT NULL,
+    `rank`              INTEGER NOT NULL
+);
+
+CREATE TABLE `external_db` (
+    `external_db_id`    INTEGER NOT NULL,
+    `db_name`           VARCHAR(100) NOT NULL,
+    PRIMARY KEY (`external_db_id`)
+);
+
+CREATE TABLE `gene` (
+    `gene_id`                   INTEGER NOT NULL,
+    `seq_region_id`             INTEGER NOT NULL,
+    `analysis_id`               INTEGER NOT NULL,
+    `display_xref_id`           INTEGER DEFAULT NULL,
+    `canonical_transcript_id`   INTEGER NOT NULL,
+    `stable_id`                 VARCHAR(128) DEFAULT NULL,
+    PRIMARY KEY (`gene_id`)
+);
+
+CREATE TABLE `gene_attrib` (
+    `gene_id`           INTEGER NOT NULL DEFAULT 0,
+    `attrib_type_id`    INTEGER NOT NULL DEFAULT 0,
+    `value`             TEXT NOT NULL
+);
+
+CREATE TABLE `meta` (
+    `meta_id`       INTEGER NOT NULL,
+    `species_id`    INTEGER DEFAULT 1,
+    `meta_key`      VARCHAR(40) NOT NULL,
+    `meta_value`    VARCHAR(255) NOT NULL,
+    PRIMARY KEY (`meta_id`)
+);
+
+CREATE TABLE `object_xref` (
+    `object_xref_id`        INTEGER NOT NULL,
+    `ensembl_id`            INTEGER NOT NULL,
+    `ensembl_object_type`   VARCHAR(20) NOT NULL,
+    `xref_id`               INTEGER NOT NULL,
+    `analysis_id`           INTEGER DEFAULT NULL,
+    PRIMARY KEY (`object_xref_id`)
+);
+
+CREATE TABLE `seq_region` (
+    `seq_region_id`     INTEGER NOT NULL,
+    `name`              VARCHAR(255) NOT NULL,
+    `coord_system_id`   INTEGER NOT NULL,
+    PRIMARY KEY (`seq_region_id`)
+);
+
+CREATE TABLE `transcript` (
+    `transcript_id`             INTEGER NOT NULL,
+    `gene_id`                   INTEGER DEFAULT NULL,
+    `seq_region_id`             INTEGER NOT NULL,
+    `analysis_id`               INTEGER NOT NULL,
+    `display_xref_id`           INTEGER DEFAULT NULL,
+    `canonical_translation_id`  INTEGER DEFAULT NULL,
+    `stable_id`                 VARCHAR(128) DEFAULT NULL,
+    PRIMARY KEY (`transcript_id`)
+);
+
+CREATE TABLE `translation` (
+    `translation_id`    INTEGER NOT NULL,
+    `transcript_id`     INTEGER NOT NULL,
+    `start_exon_id`     INTEGER NOT NULL,
+    `end_exon_id`       INTEGER NOT NULL,
+    PRIMARY KEY (`translation_id`)
+);
+
+CREATE TABLE `xref` (
+    `xref_id`           INTEGER NOT NULL,
+    `external_db_id`    INTEGER NOT NULL,
+    `display_label`     VARCHAR(512) NOT NULL,
+    PRIMARY KEY (`xref_id`)
+);
@@ -22,20 +22,29 @@ Typical usage example::
 
 """
 
+import asyncio
 from contextlib import nullcontext as does_not_raise
+import gzip
 import os
 from pathlib import Path
-from typing import ContextManager, Dict
+import shutil
+import threading
+from typing import ContextManager, Dict, List, Tuple
 
 import pytest
 from pytest import param, raises
 from _pytest.fixtures import FixtureRequest
+from _pytest.monkeypatch import MonkeyPatch
+from sqlalchemy import MetaData, bindparam, event, select, text
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 from sqlalchemy.ext.automap import automap_base
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 
-from ensembl.database import DBConnection, UnitTestDB
+from ensembl.database import export
+from ensembl.database import (AsyncDBConnection, ConnectionRegistry, DatabaseInfo, DBConnection, QueryStats,
+                              ReplicaSet, UnitTestDB, UnitTestDBError, discover_databases, export_table,
+                              fan_out, fingerprint, list_databases)
 
 
 class TestUnitTestDB:
@@ -83,6 +92,222 @@ class TestUnitTestDB:
             # Check that the database has been loaded correctly from the dump files
             result = self.dbs[db_key].dbc.execute("SELECT * FROM gibberish")
             assert len(result.fetchall()) == 6, "Unexpected number of rows found in 'gibberish' table"
+            assert set(self.dbs[db_key].load_times) == {'gibberish', 'meta'}, "Missing table load times"
+
+    def test_load_tables(self, request: FixtureRequest, tmp_path: Path) -> None:
+        """Tests that tables referenced by foreign keys are loaded before the tables referencing them, and
+        that tables in a foreign key cycle are loaded last.
+
+        Args:
+            request: Access to the requesting test context.
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        (tmp_path / 'table.sql').write_text(
+            "CREATE TABLE child (child_id INT NOT NULL, parent_id INT NOT NULL, PRIMARY KEY (child_id),\n"
+            "  FOREIGN KEY (parent_id) REFERENCES parent (parent_id));\n"
+            "CREATE TABLE parent (parent_id INT NOT NULL, PRIMARY KEY (parent_id));\n"
+            "CREATE TABLE other (other_id INT NOT NULL, PRIMARY KEY (other_id));\n"
+            "CREATE TABLE egg (egg_id INT NOT NULL, hen_id INT, PRIMARY KEY (egg_id),\n"
+            "  FOREIGN KEY (hen_id) REFERENCES hen (hen_id));\n"
+            "CREATE TABLE hen (hen_id INT NOT NULL, egg_id INT, PRIMARY KEY (hen_id),\n"
+            "  FOREIGN KEY (egg_id) REFERENCES egg (egg_id));\n"
+        )
+        (tmp_path / 'parent.txt').write_text("1\n2\n")
+        (tmp_path / 'child.txt').write_text("1\t1\n2\t2\n3\t1\n")
+        (tmp_path / 'other.txt').write_text("1\n")
+        (tmp_path / 'egg.txt').write_text("1\t2\n2\t1\n")
+        (tmp_path / 'hen.txt').write_text("1\t1\n2\t2\n")
+        db = UnitTestDB(request.config.getoption('server'), tmp_path, 'fk_db', num_workers=2)
+        try:
+            tables = ['child', 'egg', 'hen', 'other', 'parent']
+            waves, cyclic_tables = db._get_loading_waves(tables)  # pylint: disable=protected-access
+            assert waves == [['other', 'parent'], ['child']]
+            assert cyclic_tables == ['egg', 'hen']
+            assert set(db.load_times) == set(tables)
+            assert len(db.dbc.execute("SELECT * FROM child").fetchall()) == 3
+            assert len(db.dbc.execute("SELECT * FROM hen").fetchall()) == 2
+        finally:
+            db.drop()
+
+    def test_parse_tsv_file(self, tmp_path: Path) -> None:
+        """Tests that escape sequences, ``NULL`` values and escaped line breaks are parsed from TSV files.
+
+        Args:
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        tsv_file = tmp_path / 'table.txt'
+        tsv_file.write_text("1\t\\N\tplain\t\n2\ta\\tb\\\\\tc\\\nd\t\\\\N\n")
+        chunks = list(UnitTestDB._parse_tsv_file(tsv_file, 1))  # pylint: disable=protected-access
+        assert chunks == [[['1', None, 'plain', '']], [['2', 'a\tb\\', 'c\nd', '\\N']]]
+
+    def test_compressed_data_files(self, request: FixtureRequest, tmp_path: Path) -> None:
+        """Tests that gzip-compressed and Parquet data files are loaded.
+
+        Args:
+            request: Access to the requesting test context.
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        pyarrow = pytest.importorskip('pyarrow')
+        pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+        (tmp_path / 'table.sql').write_text(
+            "CREATE TABLE gz_table (gz_id INT NOT NULL, name VARCHAR(10), PRIMARY KEY (gz_id));\n"
+            "CREATE TABLE pq_table (pq_id INT NOT NULL, name VARCHAR(10), PRIMARY KEY (pq_id));\n"
+        )
+        with gzip.open(tmp_path / 'gz_table.txt.gz', 'wt') as gz_file:
+            gz_file.write("1\tone\n2\t\\N\n")
+        pq_table = pyarrow.table({'pq_id': [1, 2, 3], 'name': ['a\tb', None, 'c']})
+        pyarrow_parquet.write_table(pq_table, str(tmp_path / 'pq_table.parquet'))
+        db = UnitTestDB(request.config.getoption('server'), tmp_path, 'compressed_db')
+        try:
+            assert db.dbc.execute("SELECT * FROM gz_table").fetchall() == [(1, 'one'), (2, None)]
+            assert db.dbc.execute("SELECT * FROM pq_table").fetchall() == [(1, 'a\tb'), (2, None), (3, 'c')]
+        finally:
+            db.drop()
+        # MySQL reads the Parquet data through a named pipe, as TSV
+        tsv_path = tmp_path / 'pq_table.txt'
+        write_fifo = UnitTestDB._write_fifo  # pylint: disable=protected-access
+        write_fifo(tmp_path / 'pq_table.parquet', str(tsv_path))
+        assert tsv_path.read_text() == "1\ta\\tb\n2\t\\N\n3\tc\n"
+
+    def test_parse_sql_file(self, tmp_path: Path) -> None:
+        """Tests that comments, quoted delimiters and ``DELIMITER`` commands are handled in SQL files.
+
+        Args:
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        sql_file = tmp_path / 'table.sql'
+        sql_file.write_text(
+            "/**\n@header Tables; with a delimiter\n*/\n-- comment;\n"
+            "CREATE TABLE IF NOT EXISTS `my;table` (\n"
+            "  id INT DEFAULT '0', /* inline; comment */ name VARCHAR(10) DEFAULT 'a;b''c', # hash;\n"
+            "  PRIMARY KEY (id)\n);\n"
+            "CREATE TABLE db.other(x INT);\n"
+            "INSERT INTO other VALUES ('x\\';y');\n"
+            "DELIMITER $$\nCREATE TRIGGER t BEFORE INSERT ON other FOR EACH ROW BEGIN SET NEW.x = 1; END$$\n"
+            "DELIMITER ;\nCREATE TABLE last (a INT)\n"
+        )
+        parsed = UnitTestDB._parse_sql_file(sql_file)  # pylint: disable=protected-access
+        queries = [(str(query), table) for query, table in parsed]
+        assert queries == [
+            ("CREATE TABLE IF NOT EXISTS `my;table` (\n  id INT DEFAULT '0',   name VARCHAR(10) "
+             "DEFAULT 'a;b''c',    PRIMARY KEY (id)\n)", 'my;table'),
+            ("CREATE TABLE db.other(x INT)", 'other'),
+            ("INSERT INTO other VALUES ('x\\';y')", ''),
+            ("CREATE TRIGGER t BEFORE INSERT ON other FOR EACH ROW BEGIN SET NEW.x = 1; END", ''),
+            ("CREATE TABLE last (a INT)", 'last'),
+        ]
+        # "DELIMITER" commands right after a comment between statements, or at the start of the file
+        trigger = "CREATE TRIGGER t BEFORE INSERT ON a FOR EACH ROW BEGIN SET NEW.x = 1; END"
+        sql_file.write_text(f"CREATE TABLE a (x INT);\n-- triggers\nDELIMITER $$\n{trigger}$$\nDELIMITER ;\n")
+        parsed = UnitTestDB._parse_sql_file(sql_file)  # pylint: disable=protected-access
+        assert [str(query) for query, _ in parsed] == ["CREATE TABLE a (x INT)", trigger]
+        sql_file.write_text(
+            f"/* header */\nDELIMITER //\n{trigger}//\nDELIMITER ;\nCREATE TABLE b (y INT); // comment\n"
+        )
+        parsed = UnitTestDB._parse_sql_file(sql_file)  # pylint: disable=protected-access
+        assert [str(query) for query, _ in parsed] == [trigger, "CREATE TABLE b (y INT)"]
+
+    def test_template(self, request: FixtureRequest) -> None:
+        """Tests that databases created in template mode are cloned from a template loaded only once.
+
+        Args:
+            request: Access to the requesting test context.
+
+        """
+        server_url = request.config.getoption('server')
+        src_path = pytest.dbs_dir / 'mock_db'
+        UnitTestDB.drop_template(server_url, src_path)
+        dbs = []
+        try:
+            dbs.append(UnitTestDB(server_url, src_path, 'clone1_db', template=True))
+            template_url = UnitTestDB.get_template_url(server_url, src_path)
+            template_dbc = DBConnection(template_url)
+            assert set(template_dbc.tables) == {'gibberish', 'meta'}
+            template_dbc.dispose()
+            dbs.append(UnitTestDB(server_url, src_path, 'clone2_db', template=True))
+            for db in dbs:
+                assert db.load_times == {}, "Cloned databases should not load the dump"
+                assert set(db.dbc.tables) == {'gibberish', 'meta'}
+                assert len(db.dbc.execute("SELECT * FROM gibberish").fetchall()) == 6
+            # A template left half-loaded, e.g. by an interrupted build, must be rebuilt rather than cloned
+            UnitTestDB.drop_template(server_url, src_path)
+            partial = UnitTestDB(server_url, src_path, template_url.database[len(os.environ['USER']) + 1:])
+            partial.dbc.execute("DELETE FROM gibberish")
+            partial.dbc.dispose()
+            dbs.append(UnitTestDB(server_url, src_path, 'clone3_db', template=True))
+            assert len(dbs[-1].dbc.execute("SELECT * FROM gibberish").fetchall()) == 6
+        finally:
+            for db in dbs:
+                db.drop()
+            UnitTestDB.drop_template(server_url, src_path)
+
+    def test_snapshot(self, request: FixtureRequest) -> None:
+        """Tests that :meth:`UnitTestDB.restore()` brings back the state saved by :meth:`snapshot()`.
+
+        Args:
+            request: Access to the requesting test context.
+
+        """
+        db = UnitTestDB(request.config.getoption('server'), pytest.dbs_dir / 'mock_db', 'snapshot_db')
+        try:
+            with raises(UnitTestDBError, match=r'No snapshot'):
+                db.restore()
+            db.snapshot()
+            for _ in range(2):
+                db.dbc.execute("DELETE FROM gibberish WHERE id > 2")
+                db.dbc.execute("CREATE TABLE extra (id INTEGER NOT NULL)")
+                db.restore()
+                assert set(db.dbc.tables) == {'gibberish', 'meta'}
+                assert len(db.dbc.execute("SELECT * FROM gibberish").fetchall()) == 6
+            if db.dbc.dialect == 'mysql':
+                # The restored database must check foreign keys like a freshly loaded one, whichever pooled
+                # connection is used
+                connections = [db.dbc.connect()]
+                while connections[0].engine.pool.checkedin():
+                    connections.append(db.dbc.connect())
+                try:
+                    for conn in connections:
+                        assert conn.execute(text("SELECT @@FOREIGN_KEY_CHECKS")).scalar() == 1
+                finally:
+                    for conn in connections:
+                        conn.close()
+        finally:
+            db.drop()
+
+    def test_reuse(self, request: FixtureRequest, tmp_path: Path) -> None:
+        """Tests that databases created in reuse mode are reused, and reset, only if their dump is unchanged.
+
+        Args:
+            request: Access to the requesting test context.
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        server_url = request.config.getoption('server')
+        src_path = tmp_path / 'mock_db'
+        shutil.copytree(pytest.dbs_dir / 'mock_db', src_path)
+        db = UnitTestDB(server_url, src_path, 'reuse_db', reuse=True)
+        try:
+            assert not db.reused
+            assert db.load_times
+            db.dbc.execute("DELETE FROM gibberish")
+            db.dbc.dispose()
+            db = UnitTestDB(server_url, src_path, 'reuse_db', reuse=True)
+            assert db.reused
+            assert db.load_times == {}
+            assert set(db.dbc.tables) == {'gibberish', 'meta'}
+            assert len(db.dbc.execute("SELECT * FROM gibberish").fetchall()) == 6
+            db.dbc.dispose()
+            with (src_path / 'table.sql').open('a') as sql_file:
+                sql_file.write("-- Changed\n")
+            db = UnitTestDB(server_url, src_path, 'reuse_db', reuse=True)
+            assert not db.reused
+            assert db.load_times
+        finally:
+            db.drop()
 
     @pytest.mark.parametrize(
         "db_key",
@@ -167,6 +392,54 @@ class TestDBConnection:
         tables = {'gibberish', 'meta'}
         assert set(self.dbc.tables.keys()) == tables
 
+    @pytest.mark.dependency(depends=['test_init'], scope='class')
+    def test_lazy_reflection(self) -> None:
+        """Tests that :class:`DBConnection` reflects each table on demand when `reflect` is ``False``."""
+        dbc = DBConnection(self.dbc.url, reflect=False)
+        metadata = dbc._metadata  # pylint: disable=protected-access
+        assert not metadata.tables, "No table should be reflected on initialisation"
+        assert set(dbc.tables.keys()) == {'gibberish', 'meta'}
+        assert 'meta' in dbc.tables and 'my_table' not in dbc.tables
+        assert set(dbc.get_columns('gibberish')) == {'id', 'grp', 'value'}
+        assert set(metadata.tables.keys()) == {'gibberish'}, "Only 'gibberish' table should be reflected"
+        with raises(KeyError):
+            dbc.get_columns('my_table')
+        dbc.load_metadata()
+        assert set(dbc._metadata.tables.keys()) == {'gibberish', 'meta'}  # pylint: disable=protected-access
+        dbc.dispose()
+
+    @pytest.mark.dependency(depends=['test_init'], scope='class')
+    def test_schema_cache(self, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+        """Tests that :meth:`DBConnection.load_metadata()` stores and reuses the schema cache.
+
+        Args:
+            tmp_path: Unique temporary directory for this test.
+            monkeypatch: Helper to temporarily modify objects.
+
+        """
+        dbc = DBConnection(self.dbc.url, cache_dir=tmp_path)
+        assert len(list(tmp_path.glob('*.pickle'))) == 1, "The schema should have been cached"
+        dbc.dispose()
+        # The schema should now be loaded from the cache, without reflecting it
+        with monkeypatch.context() as mp:
+            mp.setattr(MetaData, 'reflect', lambda *args, **kwargs: pytest.fail("Schema reflected"))
+            cached_dbc = DBConnection(self.dbc.url, cache_dir=tmp_path)
+            assert set(cached_dbc.tables.keys()) == {'gibberish', 'meta'}
+            assert set(cached_dbc.get_primary_key_columns('gibberish')) == {'id', 'grp'}
+            assert cached_dbc.schema_version == 99
+            cached_dbc.dispose()
+        # A new schema version should invalidate the cache
+        with self.dbc.begin() as conn:
+            conn.execute("UPDATE meta SET meta_value = '100' WHERE meta_key = 'schema_version'")
+        try:
+            with monkeypatch.context() as mp:
+                mp.setattr(MetaData, 'reflect', lambda *args, **kwargs: pytest.fail("Schema reflected"))
+                with raises(pytest.fail.Exception, match="Schema reflected"):
+                    DBConnection(self.dbc.url, cache_dir=tmp_path)
+        finally:
+            with self.dbc.begin() as conn:
+                conn.execute("UPDATE meta SET meta_value = '99' WHERE meta_key = 'schema_version'")
+
     @pytest.mark.dependency(depends=['test_init'], scope='class')
     def test_get_primary_key_columns(self) -> None:
         """Tests :meth:`DBConnection.get_primary_key_columns()` method."""
@@ -181,6 +454,17 @@ class TestDBConnection:
         assert set(self.dbc.get_columns(table)) == {'id', 'grp', 'value'}, \
             f"Unexpected set of columns found in table '{table}'"
 
+    @pytest.mark.dependency(depends=['test_init'], scope='class')
+    def test_table_stats(self) -> None:
+        """Tests :meth:`DBConnection.table_stats()` method."""
+        stats = self.dbc.table_stats('gibberish')
+        assert stats.table == 'gibberish'
+        # MySQL and PostgreSQL only provide an estimate of the number of rows
+        assert stats.rows == 6 if self.dbc.dialect == 'sqlite' else stats.rows >= 0
+        assert (stats.min_key, stats.max_key) == (1, 6)
+        with raises(KeyError):
+            self.dbc.table_stats('unknown')
+
     @pytest.mark.dependency(depends=['test_init'], scope='class')
     def test_schema_type(self) -> None:
         """Tests :meth:`DBConnection.schema_type` property."""
@@ -191,6 +475,33 @@ class TestDBConnection:
         """Tests :meth:`DBConnection.schema_version` property."""
         assert self.dbc.schema_version == 99, "Unexpected schema version found in database's 'meta' table"
 
+    @pytest.mark.dependency(depends=['test_init'], scope='class')
+    def test_meta(self, monkeypatch: MonkeyPatch) -> None:
+        """Tests :meth:`DBConnection.meta()` and :meth:`DBConnection.invalidate_meta()` methods.
+
+        Args:
+            monkeypatch: Helper to temporarily modify objects.
+
+        """
+        dbc = DBConnection(self.dbc.url, reflect=False)
+        assert dbc.meta('schema_type') == ['compara']
+        assert dbc.meta('patch', species_id=None) == ['patch_98_99_a.sql|schema_version']
+        assert not dbc.meta('species.production_name')
+        # The meta table should not be queried again until its cache is invalidated
+        with monkeypatch.context() as mp:
+            mp.setattr(dbc, 'execute_buffered', lambda *args, **kwargs: pytest.fail("Meta table queried"))
+            assert dbc.schema_version == 99
+            dbc.invalidate_meta()
+            with raises(pytest.fail.Exception, match="Meta table queried"):
+                dbc.meta('schema_type')
+        # With a time-to-live of 0 seconds, every access should query the meta table
+        dbc = DBConnection(self.dbc.url, reflect=False, meta_ttl=0)
+        assert dbc.meta('schema_type') == ['compara']
+        with monkeypatch.context() as mp:
+            mp.setattr(dbc, 'execute_buffered', lambda *args, **kwargs: pytest.fail("Meta table queried"))
+            with raises(pytest.fail.Exception, match="Meta table queried"):
+                dbc.meta('schema_type')
+
     @pytest.mark.dependency(name='test_connect', depends=['test_init'], scope='class')
     def test_connect(self) -> None:
         """Tests :meth:`DBConnection.connect()` method."""
@@ -241,6 +552,238 @@ class TestDBConnection:
             result = self.dbc.execute(query)
             assert len(result.fetchall()) == nrows, "Unexpected number of rows returned"
 
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    def test_execute_releases_connection(self) -> None:
+        """Tests that :meth:`DBConnection.execute()` returns its connection to the pool once the result has
+        been consumed.
+        """
+        # A pool with a single connection would time out on the second query if the first one was not released
+        dbc = DBConnection(self.dbc.url, reflect=False, poolclass=QueuePool, pool_size=1, max_overflow=0,
+                           pool_timeout=1)
+        for _ in range(2):
+            assert len(dbc.execute("SELECT * FROM gibberish").fetchall()) == 6
+        assert dbc.execute("SELECT * FROM meta WHERE meta_id = 1").one()
+        assert dbc._engine.pool.checkedout() == 0  # pylint: disable=protected-access
+        dbc.dispose()
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    def test_instrument(self) -> None:
+        """Tests :meth:`DBConnection.instrument()` and :meth:`DBConnection.enable_instrumentation()`
+        methods.
+        """
+        dbc = DBConnection(self.dbc.url, reflect=False)
+        with dbc.instrument(slow_query_threshold=0) as stats:
+            for grp in ('grp1', 'grp2'):
+                dbc.execute(f"SELECT * FROM gibberish WHERE grp = '{grp}'").fetchall()
+            dbc.execute("SELECT * FROM meta WHERE meta_id = :id", id=1).fetchall()
+        dbc.execute("SELECT * FROM meta").fetchall()
+        assert stats.total_queries == 3
+        assert [(top.fingerprint, top.count) for top in stats.top(key='count')] == [
+            ("SELECT * FROM gibberish WHERE grp = ?", 2), ("SELECT * FROM meta WHERE meta_id = ?", 1)
+        ]
+        assert sum(stats.statements["SELECT * FROM gibberish WHERE grp = ?"].histogram) == 2
+        assert len(stats.slow_queries) == 3
+        assert dbc.query_stats is None
+        enabled = dbc.enable_instrumentation()
+        assert dbc.enable_instrumentation() is enabled
+        dbc.execute("SELECT * FROM meta").fetchall()
+        dbc.disable_instrumentation()
+        dbc.execute("SELECT * FROM meta").fetchall()
+        assert enabled.total_queries == 1
+        assert dbc.query_stats is None
+        dbc.dispose()
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    def test_replicas(self) -> None:
+        """Tests that read-only queries are routed to the available replicas, failing over the broken ones."""
+        url = make_url(self.dbc.url)
+        broken_url = url.set(
+            database='/nonexistent/replica.db' if self.dbc.dialect == 'sqlite' else 'nonexistent_replica_db'
+        )
+        dbc = DBConnection(url, reflect=False, replicas=[broken_url, url], replica_cooldown=60)
+        assert len(dbc.execute("SELECT * FROM gibberish").fetchall()) == 6
+        url_str = url.render_as_string(hide_password=True)
+        broken_url_str = broken_url.render_as_string(hide_password=True)
+        assert dbc.replicas.available == [url_str]
+        assert len(dbc.execute_buffered("SELECT * FROM meta").all()) == 3
+        assert [row.id for row in dbc.stream("SELECT id FROM gibberish WHERE id < 3 ORDER BY id")] == [1, 2]
+        assert dbc.replicas.check_health() == {broken_url_str: False, url_str: True}
+        dbc.dispose()
+        if self.dbc.dialect != 'sqlite':
+            # The replica URLs reported (and logged) must not disclose their passwords
+            replicas = ReplicaSet([url.set(password='s3cr3t')])
+            assert 's3cr3t' not in replicas.available[0]
+            assert 's3cr3t' not in repr(replicas)
+            replicas.dispose()
+        with raises(ValueError):
+            DBConnection(url, reflect=False, replicas=[url], routing='random')
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("SELECT * FROM gibberish", True),
+            ("  show tables", True),
+            ("SELECT * FROM gibberish FOR UPDATE", False),
+            ("DELETE FROM gibberish WHERE id = 0", False),
+        ],
+    )
+    @pytest.mark.dependency(depends=['test_init'], scope='class')
+    def test_is_read_only(self, query: str, expected: bool) -> None:
+        """Tests which queries :class:`DBConnection` considers safe to route to a read replica.
+
+        Args:
+            query: SQL query.
+            expected: Expected read-only status.
+
+        """
+        assert DBConnection._is_read_only(text(query)) == expected  # pylint: disable=protected-access
+        gibberish = self.dbc.tables['gibberish']
+        assert DBConnection._is_read_only(select([gibberish]))  # pylint: disable=protected-access
+        assert not DBConnection._is_read_only(  # pylint: disable=protected-access
+            select([gibberish]).with_for_update()
+        )
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    def test_result_cache(self, tmp_path: Path) -> None:
+        """Tests :meth:`DBConnection.enable_result_cache()` method.
+
+        Args:
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        with raises(ValueError):
+            DBConnection(self.dbc.url, reflect=False).enable_result_cache()
+        dbc = DBConnection(self.dbc.url, reflect=False, immutable=True)
+        cache = dbc.enable_result_cache(cache_dir=tmp_path)
+        query = "SELECT id FROM gibberish WHERE grp = :grp ORDER BY id"
+        with dbc.instrument() as stats:
+            for _ in range(3):
+                assert [row.id for row in dbc.execute(query, grp='grp2')] == [3, 4, 5]
+            assert [row.id for row in dbc.execute_buffered(query, grp='grp1')] == [1, 2]
+            assert len(dbc.execute(text(query).execution_options(result_cache=False), grp='grp2').all()) == 3
+        assert stats.total_queries == 3
+        assert (cache.hits, cache.misses, len(cache)) == (2, 2, 2)
+        # Results persisted on disk are shared with other handlers of the same database
+        other_dbc = DBConnection(self.dbc.url, reflect=False, immutable=True)
+        other_cache = other_dbc.enable_result_cache(cache_dir=tmp_path)
+        with other_dbc.instrument() as stats:
+            assert [row.id for row in other_dbc.execute(query, grp='grp2')] == [3, 4, 5]
+        assert stats.total_queries == 0 and other_cache.hits == 1
+        # Results larger than the size limit are evicted
+        small_cache = dbc.enable_result_cache(max_bytes=cache.size // 2)
+        dbc.execute(query, grp='grp1').all()
+        dbc.execute(query, grp='grp2').all()
+        assert len(small_cache) == 1
+        dbc.disable_result_cache()
+        assert dbc.result_cache is None
+        dbc.dispose()
+        other_dbc.dispose()
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    def test_execute_statement(self) -> None:
+        """Tests :meth:`DBConnection.register_statement()` and :meth:`DBConnection.execute_statement()`
+        methods.
+        """
+        dbc = DBConnection(self.dbc.url, reflect=False)
+        gibberish = dbc.tables['gibberish']
+        query = select([gibberish.c.id]).where(gibberish.c.grp == bindparam('grp')).order_by(gibberish.c.id)
+        dbc.register_statement('by_grp', query)
+        assert [row.id for row in dbc.execute_statement('by_grp', grp='grp2')] == [3, 4, 5]
+        compiled = dbc._compiled_statements['by_grp']  # pylint: disable=protected-access
+        assert [row.id for row in dbc.execute_statement('by_grp', {'grp': 'grp3'})] == [6]
+        assert dbc._compiled_statements['by_grp'] is compiled  # pylint: disable=protected-access
+        # Registering again under the same name replaces the statement
+        dbc.register_statement('by_grp', "SELECT COUNT(*) FROM gibberish WHERE grp = :grp")
+        assert dbc.execute_statement('by_grp', grp='grp1').scalar() == 2
+        with raises(KeyError):
+            dbc.execute_statement('unknown')
+        dbc.dispose()
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    def test_execute_buffered(self) -> None:
+        """Tests :meth:`DBConnection.execute_buffered()` method."""
+        dbc = DBConnection(self.dbc.url, reflect=False, poolclass=QueuePool, pool_size=1, max_overflow=0)
+        result = dbc.execute_buffered("SELECT * FROM gibberish WHERE grp = :grp", grp='grp2')
+        assert dbc._engine.pool.checkedout() == 0  # pylint: disable=protected-access
+        assert [row.id for row in result] == [3, 4, 5]
+        dbc.dispose()
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    def test_stream(self) -> None:
+        """Tests :meth:`DBConnection.stream()` method."""
+        rows = list(self.dbc.stream("SELECT * FROM gibberish ORDER BY id", batch_size=2))
+        assert [row.id for row in rows] == [1, 2, 3, 4, 5, 6]
+        gibberish = self.dbc.tables['gibberish']
+        query = select([gibberish.c.id]).where(gibberish.c.id > bindparam('min_id')).order_by(gibberish.c.id)
+        batches = list(self.dbc.stream(query, batch_size=2, batches=True, min_id=1))
+        assert [[row.id for row in batch] for batch in batches] == [[2, 3], [4, 5], [6]]
+        # Stopping early must release a connection that can be reused, i.e. with no unread cursor left
+        dbc = DBConnection(self.dbc.url, reflect=False, poolclass=QueuePool, pool_size=1, max_overflow=0)
+        invalidated = []
+        with dbc.connect() as conn:
+            event.listen(conn.engine, 'invalidate', lambda *args: invalidated.append(args))
+        try:
+            for _ in range(2):
+                rows = dbc.stream("SELECT * FROM gibberish ORDER BY id", batch_size=2)
+                assert next(rows).id == 1
+                rows.close()
+                assert dbc.execute("SELECT COUNT(*) FROM gibberish").scalar() == 6
+            assert not invalidated, "The connection was invalidated when returned to the pool"
+        finally:
+            dbc.dispose()
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    @pytest.mark.parametrize(
+        "columns, start_after, expected",
+        [
+            (None, None, [[(1, 'grp1', 11), (2, 'grp1', 12), (3, 'grp2', 21), (4, 'grp2', 22)],
+                          [(5, 'grp2', 23), (6, 'grp3', 31)]]),
+            (['value'], (2, 'grp1'), [[(21, 3, 'grp2'), (22, 4, 'grp2'), (23, 5, 'grp2'), (31, 6, 'grp3')]]),
+            (['id', 'grp'], (6, 'grp3'), []),
+        ],
+    )
+    def test_iter_table(self, columns: List[str], start_after: Tuple, expected: List[List[Tuple]]) -> None:
+        """Tests :meth:`DBConnection.iter_table()` method.
+
+        Args:
+            columns: Columns to retrieve.
+            start_after: Primary key of the row after which to start.
+            expected: Expected batches of rows.
+
+        """
+        batches = self.dbc.iter_table('gibberish', batch_size=4, columns=columns, start_after=start_after)
+        assert [[tuple(row) for row in batch] for batch in batches] == expected
+
+    @pytest.mark.dependency(depends=['test_init', 'test_exec1'], scope='class')
+    @pytest.mark.parametrize("method", ['load_data', 'values', 'executemany', None])
+    def test_bulk_insert(self, method: str) -> None:
+        """Tests :meth:`DBConnection.bulk_insert()` method.
+
+        Args:
+            method: Insertion method.
+
+        """
+        if (method == 'load_data') and (self.dbc.dialect != 'mysql'):
+            with raises(ValueError):
+                self.dbc.bulk_insert('gibberish', [], method=method)
+            return
+        rows = ({'id': 100 + i, 'grp': f'bulk{i % 2}', 'value': None if i % 3 else i} for i in range(25))
+        try:
+            stats = self.dbc.bulk_insert('gibberish', rows, batch_size=10, method=method)
+            assert stats.rows == 25, "Unexpected number of rows inserted"
+            assert stats.rows_per_second > 0
+            if method is None:
+                # "LOAD DATA LOCAL INFILE" is opt-in, as it may be disabled in the client or the server
+                assert stats.method == ('values' if self.dbc.dialect == 'mysql' else 'executemany')
+            result = self.dbc.execute("SELECT * FROM gibberish WHERE id >= 100 ORDER BY id").fetchall()
+            assert [tuple(row) for row in result[:4]] == [
+                (100, 'bulk0', 0), (101, 'bulk1', None), (102, 'bulk0', None), (103, 'bulk1', 3)
+            ]
+            assert len(result) == 25
+        finally:
+            with self.dbc.begin() as conn:
+                conn.execute("DELETE FROM gibberish WHERE id >= 100")
+
     @pytest.mark.dependency(depends=['test_init', 'test_connect', 'test_exec1', 'test_exec2'], scope='class')
     @pytest.mark.parametrize(
         "identifier, row1, row2, before, after",
@@ -304,3 +847,388 @@ class TestDBConnection:
                 f"SQLite/MyISAM: 2 rows have been permanently added to ID {identifier}"
         else:
             assert not results.fetchall(), f"No entries should have been permanently added to ID {identifier}"
+
+
+@pytest.mark.parametrize("db", [{'src': 'mock_db', 'name': 'export_db'}], indirect=True)
+class TestExportTable:
+    """Tests :func:`export_table` function."""
+
+    @pytest.mark.parametrize("num_partitions, use_processes", [(1, False), (2, False), (3, True)])
+    def test_export_table(self, db: UnitTestDB, tmp_path: Path, num_partitions: int,
+                          use_processes: bool) -> None:
+        """Tests that :func:`export_table()` dumps a table into a TSV file loadable by :class:`UnitTestDB`.
+
+        Args:
+            db: Unit test database (fixture).
+            tmp_path: Unique temporary directory for this test.
+            num_partitions: Number of primary key ranges to split the table into.
+            use_processes: Use a pool of processes instead of threads.
+
+        """
+        filepath = export_table(db.dbc, 'gibberish', tmp_path, num_workers=2, num_partitions=num_partitions,
+                                use_processes=use_processes)
+        assert filepath == tmp_path / 'gibberish.txt'
+        expected = (pytest.dbs_dir / 'mock_db' / 'gibberish.txt').read_text()
+        assert filepath.read_text() == expected, "Exported file differs from the original dump file"
+        assert [path.name for path in tmp_path.iterdir()] == ['gibberish.txt'], "Temporary files left behind"
+
+    def test_export_table_failure(self, db: UnitTestDB, tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+        """Tests that :func:`export_table()` passes the engine arguments on to its workers and removes the
+        partition files if a worker fails.
+
+        Args:
+            db: Unit test database (fixture).
+            tmp_path: Unique temporary directory for this test.
+            monkeypatch: Helper to temporarily modify objects.
+
+        """
+        worker_kwargs = []
+
+        def failing_connection(url: str, **kwargs) -> DBConnection:
+            worker_kwargs.append(kwargs)
+            dbc = DBConnection(url, **kwargs)
+            monkeypatch.setattr(dbc, 'stream', lambda *args, **kwargs: iter([[(1,)], [None]]))
+            return dbc
+
+        monkeypatch.setattr(export, 'DBConnection', failing_connection)
+        dbc = DBConnection(db.dbc.url, reflect=False, poolclass=QueuePool, pool_size=3,
+                           connect_args={'timeout': 7})
+        with raises(TypeError):
+            export_table(dbc, 'gibberish', tmp_path, num_workers=2, num_partitions=2)
+        assert worker_kwargs
+        for kwargs in worker_kwargs:
+            assert kwargs == {'reflect': False, 'connect_args': {'timeout': 7}, 'poolclass': NullPool}
+        assert not list(tmp_path.iterdir()), "Partition files left behind"
+        dbc.dispose()
+
+    def test_export_table_parquet(self, db: UnitTestDB, tmp_path: Path) -> None:
+        """Tests that :func:`export_table()` dumps a table into a Parquet file.
+
+        Args:
+            db: Unit test database (fixture).
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        parquet = pytest.importorskip('pyarrow.parquet')
+        filepath = export_table(db.dbc, 'gibberish', tmp_path, num_partitions=2, file_format='parquet')
+        assert filepath == tmp_path / 'gibberish.parquet'
+        content = parquet.read_table(str(filepath)).to_pydict()
+        assert content == {
+            'id': [1, 2, 3, 4, 5, 6],
+            'grp': ['grp1', 'grp1', 'grp2', 'grp2', 'grp2', 'grp3'],
+            'value': [11, 12, 21, 22, 23, 31],
+        }
+
+
+@pytest.mark.parametrize("db", [{'src': 'mock_db'}], indirect=True)
+class TestAsyncDBConnection:
+    """Tests :class:`AsyncDBConnection` class."""
+
+    @pytest.fixture(autouse=True)
+    def require_async_driver(self, db: UnitTestDB) -> None:
+        """Skips the tests if the async driver for the database dialect is not installed.
+
+        Args:
+            db: Unit test database (fixture).
+
+        """
+        pytest.importorskip(AsyncDBConnection.async_drivers[db.dbc.dialect])
+
+    def test_properties(self, db: UnitTestDB) -> None:
+        """Tests :class:`AsyncDBConnection` schema and properties.
+
+        Args:
+            db: Unit test database (fixture).
+
+        """
+        async def run() -> None:
+            async with AsyncDBConnection(db.dbc.url) as dbc:
+                assert dbc.db_name == db.dbc.db_name
+                assert dbc.dialect == db.dbc.dialect
+                assert set(dbc.tables.keys()) == {'gibberish', 'meta'}
+                assert set(dbc.get_primary_key_columns('gibberish')) == {'id', 'grp'}
+                assert await dbc.schema_type == 'compara'
+                assert await dbc.schema_version == 99
+        asyncio.run(run())
+
+    def test_execute_and_stream(self, db: UnitTestDB) -> None:
+        """Tests :meth:`AsyncDBConnection.execute()` and :meth:`AsyncDBConnection.stream()` methods, running
+        several queries concurrently.
+
+        Args:
+            db: Unit test database (fixture).
+
+        """
+        async def run() -> None:
+            async with AsyncDBConnection(db.dbc.url) as dbc:
+                query = "SELECT * FROM gibberish WHERE grp = :grp"
+                results = await asyncio.gather(*[dbc.execute(query, grp=grp) for grp in ('grp1', 'grp2')])
+                assert [len(result.all()) for result in results] == [2, 3]
+                # Keyword bound parameters are combined with the positional ones
+                query = "SELECT id FROM gibberish WHERE grp = :grp AND id > :min_id ORDER BY id"
+                result = await dbc.execute(query, {'grp': 'grp2'}, min_id=3)
+                assert [row.id for row in result] == [4, 5]
+                with raises(ValueError):
+                    await dbc.execute(query, ('grp2', 3), min_id=3)
+                batches = [batch async for batch in dbc.stream(
+                    "SELECT id FROM gibberish WHERE id < 7 ORDER BY id", batch_size=4, batches=True
+                )]
+                assert [[row.id for row in batch] for batch in batches] == [[1, 2, 3, 4], [5, 6]]
+        asyncio.run(run())
+
+    def test_session_scope(self, db: UnitTestDB) -> None:
+        """Tests :meth:`AsyncDBConnection.session_scope()` method.
+
+        Args:
+            db: Unit test database (fixture).
+
+        """
+        async def run() -> None:
+            async with AsyncDBConnection(db.dbc.url) as dbc:
+                meta = dbc.tables['meta']
+                async with dbc.session_scope() as session:
+                    result = await session.execute(select([meta.c.meta_value]).where(meta.c.meta_id == 2))
+                    assert result.scalar_one() == 'compara'
+        asyncio.run(run())
+
+
+@pytest.mark.parametrize("multi_dbs", [[{'src': 'mock_db'}, {'src': 'mock_db', 'name': 'registry_db'}]],
+                         indirect=True)
+class TestConnectionRegistry:
+    """Tests :class:`ConnectionRegistry` class."""
+
+    def test_get(self, multi_dbs: Dict[str, UnitTestDB]) -> None:
+        """Tests that :meth:`ConnectionRegistry.get()` returns one cached handle per database, sharing the
+        engine of the server on MySQL.
+
+        Args:
+            multi_dbs: Dictionary of unit test databases (fixture).
+
+        """
+        registry = ConnectionRegistry(max_connections=2)
+        try:
+            handles = [registry.get(db.dbc.url, reflect=False) for db in multi_dbs.values()]
+            assert registry.get(make_url(multi_dbs['mock_db'].dbc.url)) is handles[0]
+            for db, handle in zip(multi_dbs.values(), handles):
+                assert handle.db_name == db.dbc.db_name
+                assert handle.url == db.dbc.url
+                # Text queries and queries built from the reflected tables must hit the handle's database
+                assert handle.execute("SELECT COUNT(*) FROM meta").scalar() == 3
+                assert handle.schema_version == 99
+                meta = handle.tables['meta']
+                assert len(handle.execute(select([meta.c.meta_key])).fetchall()) == 3
+            if handles[0].dialect == 'mysql':
+                assert handles[0]._engine.pool is handles[1]._engine.pool
+                assert handles[0]._engine.pool.size() == 2
+                # Disposing of a handle must not tear down the pool shared with the other handles
+                pool = handles[0]._engine.pool
+                handles[0].dispose()
+                assert handles[1]._engine.pool is pool
+        finally:
+            registry.dispose()
+
+    def test_get_concurrent(self, multi_dbs: Dict[str, UnitTestDB], monkeypatch: MonkeyPatch) -> None:
+        """Tests that a slow handle creation does not block the lookups of other threads.
+
+        Args:
+            multi_dbs: Dictionary of unit test databases (fixture).
+            monkeypatch: Helper to temporarily modify objects.
+
+        """
+        registry = ConnectionRegistry()
+        slow_url = multi_dbs['mock_db'].dbc.url
+        create_handle = registry._create_handle  # pylint: disable=protected-access
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_create_handle(url, *args, **kwargs):
+            if str(url) == slow_url:
+                started.set()
+                release.wait(10)
+            return create_handle(url, *args, **kwargs)
+
+        monkeypatch.setattr(registry, '_create_handle', slow_create_handle)
+        handles = {}  # type: Dict[str, DBConnection]
+
+        def get(key: str) -> None:
+            handles[key] = registry.get(multi_dbs[key].dbc.url, reflect=False)
+
+        slow_thread = threading.Thread(target=get, args=('mock_db',))
+        fast_thread = threading.Thread(target=get, args=('registry_db',))
+        try:
+            slow_thread.start()
+            assert started.wait(10)
+            fast_thread.start()
+            fast_thread.join(5)
+            assert not fast_thread.is_alive(), "Lookup blocked by the creation of another handle"
+        finally:
+            release.set()
+            slow_thread.join()
+            fast_thread.join()
+            registry.dispose()
+        for key, handle in handles.items():
+            assert handle.db_name == multi_dbs[key].dbc.db_name
+
+    def test_get_kwargs(self, multi_dbs: Dict[str, UnitTestDB]) -> None:
+        """Tests that the arguments given to :meth:`ConnectionRegistry.get()` override the registry's ones.
+
+        Args:
+            multi_dbs: Dictionary of unit test databases (fixture).
+
+        """
+        registry = ConnectionRegistry(pool_pre_ping=True, echo=True)
+        try:
+            handle = registry.get(multi_dbs['mock_db'].dbc.url, reflect=False, echo=False)
+            assert handle.execute("SELECT COUNT(*) FROM meta").scalar() == 3
+            if handle.dialect != 'mysql':
+                assert handle.engine_kwargs == {'pool_pre_ping': True, 'echo': False}
+        finally:
+            registry.dispose()
+
+
+class TestQueryStats:
+    """Tests :class:`QueryStats` class and :func:`fingerprint()` function."""
+
+    @pytest.mark.parametrize(
+        "statement, expected",
+        [
+            ("SELECT *\n  FROM t WHERE a = 'x''y' AND b = 1.5;", "SELECT * FROM t WHERE a = ? AND b = ?"),
+            ("SELECT * FROM t1 WHERE id IN (1, 2, 3) -- comment", "SELECT * FROM t1 WHERE id IN (...)"),
+            ("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)", "INSERT INTO t (a, b) VALUES (...)"),
+            ("SELECT /* hint */ a FROM t WHERE b = :b", "SELECT a FROM t WHERE b = ?"),
+        ],
+    )
+    def test_fingerprint(self, statement: str, expected: str) -> None:
+        """Tests :func:`fingerprint()` function.
+
+        Args:
+            statement: SQL statement.
+            expected: Expected fingerprint.
+
+        """
+        assert fingerprint(statement) == expected
+
+    def test_record(self) -> None:
+        """Tests :meth:`QueryStats.record()` method."""
+        stats = QueryStats(slow_query_threshold=1.0, buckets=(0.1, 1.0))
+        stats.record("SELECT 1", None, 0.05, -1)
+        stats.record("SELECT 2", None, 0.5, 3)
+        stats.record("SELECT 3", None, 2.0, 4)
+        statement = stats.statements["SELECT ?"]
+        assert (statement.count, statement.rows, statement.max_seconds) == (3, 7, 2.0)
+        assert statement.histogram == [1, 1, 1]
+        assert [query.statement for query in stats.slow_queries] == ["SELECT 3"]
+        stats.reset()
+        assert stats.total_queries == 0 and not stats.slow_queries
+
+
+@pytest.mark.parametrize("multi_dbs", [[{'src': 'mock_db'}, {'src': 'mock_db', 'name': 'fan_out_db'}]],
+                         indirect=True)
+class TestServer:
+    """Tests :mod:`server` module."""
+
+    def test_list_databases(self, request: FixtureRequest, multi_dbs: Dict[str, UnitTestDB]) -> None:
+        """Tests :func:`list_databases()` function.
+
+        Args:
+            request: Access to the requesting test context.
+            multi_dbs: Dictionary of unit test databases (fixture).
+
+        """
+        server_url = request.config.getoption('server')
+        db_names = [db.dbc.db_name for db in multi_dbs.values()]
+        assert set(db_names) <= set(list_databases(server_url))
+        prefix = os.environ['USER']
+        assert list_databases(server_url, f"{prefix}\\_fan%") == [f"{prefix}_fan_out_db"]
+
+    def test_discover_databases(self, request: FixtureRequest, multi_dbs: Dict[str, UnitTestDB],
+                                tmp_path: Path) -> None:
+        """Tests :func:`discover_databases()` function.
+
+        Args:
+            request: Access to the requesting test context.
+            multi_dbs: Dictionary of unit test databases (fixture).
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        server_url = request.config.getoption('server')
+        prefix = os.environ['USER']
+        databases = discover_databases(server_url, f"{prefix}\\_%\\_db")
+        found = {database.name: database for database in databases}
+        for db in multi_dbs.values():
+            assert found[db.dbc.db_name] == DatabaseInfo(db.dbc.db_name, 'compara', 99)
+        # SQLite databases outside the current directory
+        core_dbc = DBConnection(f"sqlite:///{tmp_path / 'a_core_1'}", reflect=False)
+        core_dbc.execute("CREATE TABLE meta (meta_key VARCHAR(40), meta_value VARCHAR(40))")
+        core_dbc.execute("INSERT INTO meta VALUES ('schema_type', 'core'), ('schema_version', '110')")
+        core_dbc.dispose()
+        (tmp_path / 'b_other').write_bytes(b'')
+        assert discover_databases(f"sqlite:///{tmp_path}/") == [
+            DatabaseInfo('a_core_1', 'core', 110), DatabaseInfo('b_other')
+        ]
+
+    def test_fan_out(self, request: FixtureRequest, multi_dbs: Dict[str, UnitTestDB], tmp_path: Path) -> None:
+        """Tests :func:`fan_out()` function, capturing errors and timeouts.
+
+        Args:
+            request: Access to the requesting test context.
+            multi_dbs: Dictionary of unit test databases (fixture).
+            tmp_path: Unique temporary directory for this test.
+
+        """
+        dbcs = [db.dbc for db in multi_dbs.values()]
+        query = "SELECT meta_value FROM meta WHERE meta_key = :key"
+        results = list(fan_out(query, dbcs, max_workers=2, key='schema_version'))
+        assert sorted(result.db_name for result in results) == sorted(dbc.db_name for dbc in dbcs)
+        assert all(result.error is None and result.rows == [('99',)] for result in results)
+        # Query the databases on the server matching the pattern
+        server_url = request.config.getoption('server')
+        pattern = f"{os.environ['USER']}\\_fan\\_out\\_db"
+        results = list(fan_out("SELECT COUNT(*) FROM gibberish", server_url, pattern=pattern))
+        expected = [(f"{os.environ['USER']}_fan_out_db", [(6,)])]
+        assert [(result.db_name, result.rows) for result in results] == expected
+        # Errors are reported per database
+        results = list(fan_out("SELECT * FROM unknown_table", dbcs))
+        assert len(results) == 2 and all(isinstance(result.error, SQLAlchemyError) for result in results)
+        # SQLite databases outside the current directory are reported by their listed names, not their paths
+        for name in ('a_db', 'b_db'):
+            dbc = DBConnection(f"sqlite:///{tmp_path / name}", reflect=False)
+            dbc.execute("CREATE TABLE meta (meta_key VARCHAR(40), meta_value VARCHAR(40))")
+            dbc.dispose()
+        sqlite_url = f"sqlite:///{tmp_path}/"
+        results = list(fan_out("SELECT COUNT(*) FROM meta", sqlite_url))
+        assert sorted((result.db_name, result.rows) for result in results) == [
+            ('a_db', [(0,)]), ('b_db', [(0,)])
+        ]
+        # Only the given databases are queried
+        results = list(fan_out("SELECT COUNT(*) FROM meta", sqlite_url, names=['b_db']))
+        assert [result.db_name for result in results] == ['b_db']
+
+    def test_fan_out_timeout(self, multi_dbs: Dict[str, UnitTestDB], monkeypatch: MonkeyPatch) -> None:
+        """Tests that :func:`fan_out()` reports the databases that do not answer in time.
+
+        Args:
+            multi_dbs: Dictionary of unit test databases (fixture).
+            monkeypatch: Monkeypatch fixture.
+
+        """
+        dbcs = [db.dbc for db in multi_dbs.values()]
+        slow_dbc = dbcs[1]
+        original_execute = DBConnection.execute
+        release = threading.Event()
+
+        def execute(self, *args, **kwargs):
+            if self is slow_dbc:
+                # Hang until the test is over
+                release.wait(10)
+                raise RuntimeError("Query interrupted")
+            return original_execute(self, *args, **kwargs)
+
+        monkeypatch.setattr(DBConnection, 'execute', execute)
+        try:
+            results = {result.db_name: result for result in fan_out("SELECT 1", dbcs, timeout=0.2)}
+        finally:
+            release.set()
+        assert results[dbcs[0].db_name].error is None
+        assert isinstance(results[slow_dbc.db_name].error, TimeoutError)
+